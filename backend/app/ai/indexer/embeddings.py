@@ -1,36 +1,186 @@
 """Code embeddings generation."""
 
-from typing import List, Dict, Any
+import hashlib
+import os
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
 import numpy as np
 
+try:
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    torch = None
+    AutoModel = None
+    AutoTokenizer = None
+    TRANSFORMERS_AVAILABLE = False
+
+EMBEDDING_CACHE_SIZE = 4096
+MAX_SEQUENCE_LENGTH = 512
+MAX_BATCH_TOKENS = 16384
+
 class EmbeddingsGenerator:
     """
     Generates embeddings for code analysis.
+    Embeddings are cached by content hash, in memory and optionally on disk,
+    so unchanged snippets never reach the model twice.
+
+    Every returned embedding is a contiguous unit-norm float32 vector, so
+    cosine similarity between two embeddings is a plain dot product.
     """
-    
-    def __init__(self, model_name: str = "code2vec/default"):
+
+    def __init__(self, model_name: str = "code2vec/default", cache_dir: Optional[str] = None,
+                 max_batch_tokens: int = MAX_BATCH_TOKENS):
         self.model_name = model_name
-        
+        self.cache_dir = cache_dir
+        self.max_batch_tokens = max_batch_tokens
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._tokenizer = None
+        self._model = None
+
     def generate_embeddings(self, code: str) -> np.ndarray:
         """
         Generate embeddings for code.
-        
+
         Args:
             code: Source code to embed
-            
+
         Returns:
-            numpy array of embeddings
+            Unit-norm float32 numpy array of embeddings
         """
-        pass
-        
+        return self.batch_generate([code])[0]
+
     def batch_generate(self, code_snippets: List[str]) -> List[np.ndarray]:
         """
         Generate embeddings for multiple code snippets.
-        
+        Cache hits are served directly and all misses are embedded together.
+
         Args:
             code_snippets: List of code snippets
-            
+
         Returns:
-            List of embedding arrays
+            List of unit-norm float32 embedding arrays
         """
-        pass
+        keys = [self._cache_key(code) for code in code_snippets]
+        embeddings = [self._cache_get(key) for key in keys]
+
+        misses: Dict[str, int] = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                misses.setdefault(keys[i], i)
+
+        if misses:
+            computed = dict(zip(misses, self._embed_batch([code_snippets[i] for i in misses.values()])))
+            for key, embedding in computed.items():
+                self._cache_put(key, embedding)
+            embeddings = [computed[key] if embedding is None else embedding
+                          for key, embedding in zip(keys, embeddings)]
+
+        return embeddings
+
+    def _embed_batch(self, code_snippets: List[str]) -> List[np.ndarray]:
+        """
+        Run the embedding model over snippets that missed the cache.
+        Snippets are tokenized once and fed to the model in padded batches
+        whose size stays within ``max_batch_tokens``.
+
+        Args:
+            code_snippets: List of code snippets
+
+        Returns:
+            List of mean-pooled, unit-norm embedding arrays
+        """
+        tokenizer, model = self._load_model()
+        input_ids = tokenizer(code_snippets, truncation=True, max_length=MAX_SEQUENCE_LENGTH)["input_ids"]
+
+        embeddings = []
+        for start, end in self._token_batches([len(ids) for ids in input_ids]):
+            encoded = tokenizer.pad({"input_ids": input_ids[start:end]}, return_tensors="pt")
+            with torch.inference_mode():
+                hidden = model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            vectors = pooled.float().cpu().numpy()
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+            embeddings.extend(np.ascontiguousarray(vectors, dtype=np.float32))
+
+        return embeddings
+
+    def _token_batches(self, lengths: List[int]) -> List[tuple[int, int]]:
+        """
+        Split sequences into contiguous batches whose padded size
+        (longest sequence times batch size) fits the token budget.
+
+        Args:
+            lengths: Token count of each sequence
+
+        Returns:
+            List of (start, end) slices
+        """
+        batches = []
+        start = 0
+        longest = 0
+        for i, length in enumerate(lengths):
+            longest_with_item = max(longest, length)
+            if i > start and longest_with_item * (i - start + 1) > self.max_batch_tokens:
+                batches.append((start, i))
+                start = i
+                longest_with_item = length
+            longest = longest_with_item
+        if start < len(lengths):
+            batches.append((start, len(lengths)))
+        return batches
+
+    def _load_model(self):
+        """Lazily load the tokenizer and model on first use."""
+        if self._model is None:
+            if not TRANSFORMERS_AVAILABLE:
+                raise RuntimeError("transformers and torch are required to generate embeddings")
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self._model = AutoModel.from_pretrained(self.model_name)
+            self._model.eval()
+        return self._tokenizer, self._model
+
+    def _cache_key(self, code: str) -> str:
+        """Content hash identifying a snippet for the current model."""
+        return hashlib.sha256(code.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+    def _cache_file(self, key: str) -> str:
+        """On-disk location of a cached embedding."""
+        return os.path.join(self.cache_dir, self.model_name.replace("/", "__"), f"{key}.npy")
+
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        """Look up an embedding in memory, then on disk."""
+        embedding = self._cache.get(key)
+        if embedding is not None:
+            self._cache.move_to_end(key)
+            return embedding
+
+        if self.cache_dir:
+            try:
+                embedding = np.load(self._cache_file(key))
+            except (OSError, ValueError):
+                return None
+            self._remember(key, embedding)
+
+        return embedding
+
+    def _cache_put(self, key: str, embedding: np.ndarray) -> None:
+        """Store an embedding in memory and, if configured, on disk."""
+        self._remember(key, embedding)
+
+        if self.cache_dir:
+            cache_file = self._cache_file(key)
+            try:
+                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                np.save(cache_file, embedding)
+            except OSError:
+                pass
+
+    def _remember(self, key: str, embedding: np.ndarray) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry when full."""
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        if len(self._cache) > EMBEDDING_CACHE_SIZE:
+            self._cache.popitem(last=False)
@@ -1,35 +1,250 @@
 """Semantic code search using embeddings."""
 
-from typing import List, Dict, Any
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 import numpy as np
 from app.ai.indexer.embeddings import EmbeddingsGenerator
 
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    simsimd = None
+    SIMSIMD_AVAILABLE = False
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
+# Below this corpus size an exact scan is faster than training IVF-PQ
+IVF_PQ_MIN_VECTORS = 10000
+PQ_SUBQUANTIZERS = 16
+PQ_BITS = 8
+IVF_NPROBE = 8
+PAIRWISE_CHUNK_ROWS = 4096
+# Approximate candidates kept per requested result for the float32 rerank
+RERANK_FACTOR = 4
+INDEX_READ_WORKERS = 32
+INDEX_EMBED_BATCH = 64
+
+
+def _quantize_rows(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization, returning the int8 rows and their scales."""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _read_source(path: str) -> str:
+    """Read a source file, hinting the kernel to read ahead sequentially."""
+    with open(path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return f.read().decode("utf-8", errors="replace")
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale every row to unit length so cosine similarity becomes a dot product."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
 class SemanticSearch:
     """
     Semantic search using code embeddings.
     """
-    
-    def __init__(self, embeddings_generator: EmbeddingsGenerator):
+
+    def __init__(self, embeddings_generator: EmbeddingsGenerator, index_path: Optional[str] = None):
         self.embeddings_generator = embeddings_generator
-        
+        self.index_path = index_path
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._paths: List[str] = []
+        self._matrix_i8: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._index = None
+
     def index_code(self, code_files: Dict[str, str]) -> None:
         """
         Index code files for search.
-        
+
+        The unit-norm embeddings are stacked into a single (N, D) float32
+        matrix, with ``_paths`` holding the file path of each row. With
+        simsimd an int8 copy is kept for fast candidate scoring, and large
+        corpora are additionally indexed with FAISS IVF-PQ when available.
+
         Args:
             code_files: Dict mapping file paths to code content
         """
-        pass
-        
+        self._build_index(
+            list(code_files.keys()),
+            self.embeddings_generator.batch_generate(list(code_files.values()))
+        )
+
+    def index_paths(self, paths: List[str], batch_size: int = INDEX_EMBED_BATCH) -> None:
+        """
+        Index source files straight from disk.
+
+        Files are read by a thread pool while earlier batches are being
+        embedded, so disk latency overlaps with model time.
+
+        Args:
+            paths: Paths of the files to index
+            batch_size: Number of files embedded per ``batch_generate`` call
+        """
+        embeddings: List[np.ndarray] = []
+        batch: List[str] = []
+        with ThreadPoolExecutor(max_workers=INDEX_READ_WORKERS) as executor:
+            for content in executor.map(_read_source, paths):
+                batch.append(content)
+                if len(batch) == batch_size:
+                    embeddings.extend(self.embeddings_generator.batch_generate(batch))
+                    batch = []
+        if batch:
+            embeddings.extend(self.embeddings_generator.batch_generate(batch))
+
+        self._build_index(list(paths), embeddings)
+
+    def _build_index(self, paths: List[str], embeddings: List[np.ndarray]) -> None:
+        """
+        Replace the indexed corpus.
+
+        Args:
+            paths: File path of each embedding
+            embeddings: Unit-norm embeddings in the same order as ``paths``
+
+        Raises:
+            ValueError: If any embedding is not unit-norm
+        """
+        self._paths = paths
+        self._matrix_i8 = None
+        self._scales = None
+        self._index = None
+        if not self._paths:
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+            return
+
+        self._matrix = np.ascontiguousarray(np.vstack(embeddings), dtype=np.float32)
+        if not np.allclose(np.linalg.norm(self._matrix, axis=1), 1.0, atol=1e-3):
+            raise ValueError("EmbeddingsGenerator must return unit-norm embeddings")
+        if SIMSIMD_AVAILABLE:
+            self._matrix_i8, self._scales = _quantize_rows(self._matrix)
+        self._index = self._build_ivfpq_index(self._matrix)
+
+    def _build_ivfpq_index(self, matrix: np.ndarray):
+        """
+        Build an inner-product IVF-PQ index over the normalized matrix.
+
+        Args:
+            matrix: Row-normalized (N, D) float32 embeddings
+
+        Returns:
+            Trained FAISS index, or None when an exact scan should be used
+        """
+        count, dim = matrix.shape
+        if not FAISS_AVAILABLE or count < IVF_PQ_MIN_VECTORS or dim % PQ_SUBQUANTIZERS:
+            return None
+
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(
+            quantizer, dim, int(math.sqrt(count)), PQ_SUBQUANTIZERS, PQ_BITS,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(matrix)
+        index.add(matrix)
+        index.nprobe = IVF_NPROBE
+
+        if self.index_path:
+            faiss.write_index(index, self.index_path)
+
+        return index
+
     def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
         Search indexed code semantically.
-        
+
         Args:
             query: Search query
             top_k: Number of results to return
-            
+
         Returns:
             List of search results with scores
         """
-        pass
+        if not self._paths or top_k <= 0:
+            return []
+
+        query_vec = np.asarray(self.embeddings_generator.generate_embeddings(query), dtype=np.float32)
+        query_vec = _normalize_rows(query_vec.reshape(1, -1))
+
+        top_k = min(top_k, len(self._paths))
+
+        shortlist_size = min(top_k * RERANK_FACTOR, len(self._paths))
+        if self._index is not None:
+            _, ids = self._index.search(query_vec, shortlist_size)
+            candidates = ids[0][ids[0] >= 0]
+        elif self._matrix_i8 is not None:
+            candidates = self._int8_shortlist(query_vec, shortlist_size)
+        else:
+            candidates = np.arange(len(self._paths))
+        if not len(candidates):
+            return []
+        top_k = min(top_k, len(candidates))
+
+        # Gather shortlisted rows in ascending order so the reads walk the
+        # matrix front to back instead of scattering across it
+        candidates = np.sort(candidates)
+
+        # Rows and query are unit-norm, so the inner product is the cosine
+        sims = self._matrix[candidates] @ query_vec[0]
+        best = np.argpartition(-sims, top_k - 1)[:top_k]
+        best = best[np.argsort(-sims[best])]
+
+        return [
+            {"file_path": self._paths[candidates[i]], "score": float(sims[i])}
+            for i in best
+        ]
+
+    def _int8_shortlist(self, query_vec: np.ndarray, size: int) -> np.ndarray:
+        """
+        Approximate scoring on the int8 matrix to pick rerank candidates.
+
+        Args:
+            query_vec: Normalized (1, D) float32 query
+            size: Number of candidates to keep
+
+        Returns:
+            Row indices of the best approximate matches
+        """
+        query_i8, query_scale = _quantize_rows(query_vec)
+        approx = np.asarray(simsimd.cdist(query_i8, self._matrix_i8, metric="dot"))[0]
+        approx *= self._scales * query_scale[0]
+        return np.argpartition(-approx, size - 1)[:size]
+
+    def pairwise_similarities(self, chunk_rows: int = PAIRWISE_CHUNK_ROWS) -> np.ndarray:
+        """
+        Cosine similarity between every pair of indexed files, e.g. for
+        clustering near-duplicate code.
+
+        Computed as blocked matrix products written straight into the
+        output, so no temporaries beyond the (N, N) result are allocated.
+
+        Args:
+            chunk_rows: Number of rows multiplied per BLAS call
+
+        Returns:
+            (N, N) float32 similarity matrix clipped to [0, 1], rows and
+            columns ordered like the indexed paths
+        """
+        count = len(self._paths)
+        similarities = np.empty((count, count), dtype=np.float32)
+        for start in range(0, count, chunk_rows):
+            end = min(start + chunk_rows, count)
+            np.matmul(self._matrix[start:end], self._matrix.T, out=similarities[start:end])
+        np.clip(similarities, 0.0, 1.0, out=similarities)
+        return similarities
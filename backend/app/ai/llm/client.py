@@ -1,37 +1,301 @@
 """CodeLlama client for code analysis."""
 
-from typing import Dict, Any
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
+from app.ai.llm.prompts import (
+    PROMPT_PREFIXES,
+    render_analysis,
+    render_improvement,
+    render_security,
+)
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    diskcache = None
+    DISKCACHE_AVAILABLE = False
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+RESPONSE_CACHE_SIZE_LIMIT = 256 * 1024 * 1024
+BUCKET_BIN_WIDTH = 64
+APPROX_CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class ProcessorConfig:
+    """Concurrency and retry settings for CodeLlama requests."""
+    max_workers: int = 16
+    max_retries: int = 3
+    batch_size: int = 10
+    backoff_seconds: float = 1.0
+    timeout_seconds: float = 120.0
+
 
 class CodeLlamaClient:
     """
     Client for interacting with CodeLlama API.
+    One pooled AsyncClient is kept per instance so concurrent requests
+    reuse keep-alive connections. Completed responses are cached on disk
+    per (model, prompt), so they survive restarts and are shared by every
+    instance and worker process.
     """
-    
-    def __init__(self, model_name: str = "codellama/34b"):
+
+    _response_cache: Optional["diskcache.Cache"] = None
+
+    def __init__(self, model_name: str = "codellama/34b", base_url: Optional[str] = None,
+                 config: Optional[ProcessorConfig] = None):
         self.model_name = model_name
-        
-    def analyze_code(self, code: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        self.base_url = base_url or os.getenv("CODELLAMA_API_URL", "http://localhost:8000")
+        self.config = config or ProcessorConfig()
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.config.timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=self.config.max_workers,
+                max_keepalive_connections=self.config.max_workers
+            )
+        )
+
+    async def analyze_code(self, code: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Analyze code using CodeLlama.
-        
+
         Args:
             code: Code to analyze
             context: Additional context for analysis
-            
+
         Returns:
             Analysis results
         """
-        pass
-        
-    def suggest_improvements(self, code: str, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = render_analysis(code, json.dumps(context or {}, indent=2, sort_keys=True))
+        return await self._complete(prompt)
+
+    async def analyze_security(self, code: str) -> Dict[str, Any]:
+        """
+        Run a security-focused analysis using CodeLlama.
+
+        Args:
+            code: Code to analyze
+
+        Returns:
+            Security analysis results
+        """
+        return await self._complete(render_security(code))
+
+    async def analyze_batch(self, codes: List[str], context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze several code snippets using batched completion requests.
+        Prompts of similar length are grouped into the same request and at
+        most ``config.max_workers`` requests are in flight at once.
+
+        Args:
+            codes: Code snippets to analyze
+            context: Additional context shared by all snippets
+
+        Returns:
+            Analysis results in the same order as ``codes``
+        """
+        rendered_context = json.dumps(context or {}, indent=2, sort_keys=True)
+        prompts = [render_analysis(code, rendered_context) for code in codes]
+        return await self._complete_many(prompts)
+
+    async def suggest_improvements(self, code: str, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate improvement suggestions based on analysis.
-        
+
         Args:
             code: Original code
             analysis_results: Results from previous analysis
-            
+
         Returns:
             Improvement suggestions
         """
-        pass
+        prompt = render_improvement(code, json.dumps(analysis_results, indent=2, sort_keys=True))
+        return await self._complete(prompt)
+
+    async def warm_prefix_cache(self) -> None:
+        """
+        Prefill the static prompt prefixes once so a server with prefix
+        caching keeps their KV cache warm before real traffic arrives.
+        """
+        await asyncio.gather(*(
+            self._client.post(
+                "/v1/completions",
+                json={"model": self.model_name, "prompt": prefix, "max_tokens": 1}
+            )
+            for prefix in PROMPT_PREFIXES
+        ), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        await self._client.aclose()
+
+    async def _complete(self, prompt: str) -> Dict[str, Any]:
+        """
+        Complete a single prompt.
+
+        Args:
+            prompt: Fully rendered prompt
+
+        Returns:
+            Parsed completion result
+        """
+        return (await self._complete_many([prompt]))[0]
+
+    async def _complete_many(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Complete several prompts. Identical prompts within the cache TTL are
+        answered from the response cache; the rest are sent in
+        length-bucketed batches.
+
+        Args:
+            prompts: Fully rendered prompts
+
+        Returns:
+            Parsed completion results in the same order as ``prompts``
+        """
+        keys = [
+            hashlib.blake2b(f"{self.model_name}|{prompt}".encode(), digest_size=16).hexdigest()
+            for prompt in prompts
+        ]
+        results = await asyncio.to_thread(self._load_responses, keys)
+        misses = [i for i, result in enumerate(results) if result is None]
+
+        if misses:
+            semaphore = asyncio.Semaphore(self.config.max_workers)
+
+            async def complete_bucket(bucket: List[int]) -> None:
+                async with semaphore:
+                    completions = await self._request_completions([prompts[i] for i in bucket])
+                for i, result in zip(bucket, completions):
+                    results[i] = result
+                await asyncio.to_thread(
+                    self._store_responses,
+                    [(keys[i], result) for i, result in zip(bucket, completions)]
+                )
+
+            await asyncio.gather(*(
+                complete_bucket([misses[j] for j in bucket])
+                for bucket in self._bucket([prompts[i] for i in misses])
+            ))
+
+        return results
+
+    def _bucket(self, prompts: List[str], bin_width: int = BUCKET_BIN_WIDTH) -> List[List[int]]:
+        """
+        Group prompts of similar length so batched requests waste little
+        compute on padding.
+
+        Args:
+            prompts: Prompts to group
+            bin_width: Maximum token-length spread within one bucket
+
+        Returns:
+            Buckets of indices into ``prompts``
+        """
+        lengths = [len(prompt) // APPROX_CHARS_PER_TOKEN for prompt in prompts]
+        order = sorted(range(len(prompts)), key=lengths.__getitem__)
+
+        buckets: List[List[int]] = []
+        for i in order:
+            if (buckets
+                    and len(buckets[-1]) < self.config.batch_size
+                    and lengths[i] - lengths[buckets[-1][0]] <= bin_width):
+                buckets[-1].append(i)
+            else:
+                buckets.append([i])
+        return buckets
+
+    @classmethod
+    def _get_response_cache(cls) -> Optional["diskcache.Cache"]:
+        """Open the on-disk response cache on first use, if diskcache is installed."""
+        if not DISKCACHE_AVAILABLE:
+            return None
+        if cls._response_cache is None:
+            cache_dir = os.getenv("ARCHON_CACHE_DIR", ".archon_cache")
+            cls._response_cache = diskcache.Cache(
+                os.path.join(cache_dir, "llm"),
+                size_limit=RESPONSE_CACHE_SIZE_LIMIT
+            )
+        return cls._response_cache
+
+    def _load_responses(self, cache_keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up cached completions.
+
+        Args:
+            cache_keys: Response cache keys
+
+        Returns:
+            Cached completion per key, or None on a miss
+        """
+        cache = self._get_response_cache()
+        if cache is None:
+            return [None] * len(cache_keys)
+        return [cache.get(key) for key in cache_keys]
+
+    def _store_responses(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Insert completions into the shared response cache.
+
+        Args:
+            entries: (cache key, completion) pairs
+        """
+        cache = self._get_response_cache()
+        if cache is None:
+            return
+        for cache_key, result in entries:
+            cache.set(cache_key, result, expire=RESPONSE_CACHE_TTL_SECONDS)
+
+    async def _request_completions(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Call the completion endpoint for a batch of prompts, retrying
+        transient failures with exponential backoff.
+
+        Args:
+            prompts: Prompts sent together in one request
+
+        Returns:
+            Parsed completion results in the same order as ``prompts``
+        """
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                response = await self._client.post(
+                    "/v1/completions",
+                    json={"model": self.model_name, "prompt": prompts}
+                )
+                response.raise_for_status()
+                return self._parse_completions(response.json(), len(prompts))
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = (
+                    isinstance(e, httpx.TransportError)
+                    or e.response.status_code in RETRYABLE_STATUS_CODES
+                )
+                if not retryable or attempt == self.config.max_retries:
+                    raise
+                await asyncio.sleep(self.config.backoff_seconds * 2 ** attempt)
+
+    def _parse_completions(self, payload: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+        """
+        Extract the generated texts from a batched completion response.
+
+        Args:
+            payload: JSON body returned by the completion endpoint
+            count: Number of prompts in the request
+
+        Returns:
+            One dict with the model name and generated content per prompt
+        """
+        texts = [""] * count
+        for position, choice in enumerate(payload.get("choices") or []):
+            index = choice.get("index", position)
+            if 0 <= index < count:
+                texts[index] = choice.get("text", "")
+        return [{"model": self.model_name, "content": text} for text in texts]
@@ -1,11 +1,24 @@
-"""Prompt templates for AI analysis."""
+"""Prompt templates for AI analysis.
 
-ANALYSIS_PROMPT = """
+Each template is split into a static instruction prefix and a
+parameterized argument block. The prefix always comes first so inference
+servers with prefix caching (e.g. vLLM) can reuse its KV cache across
+requests and only prefill the argument block.
+
+The ``render_*`` helpers substitute into templates compiled once at
+import time instead of re-parsing a format string on every request.
+"""
+
+from string import Template
+
+ANALYSIS_SYSTEM = """
 Analyze the following code and provide:
 1. Code quality assessment
 2. Potential issues and risks
 3. Improvement suggestions
+"""
 
+ANALYSIS_ARGS = """
 Code:
 {code}
 
@@ -13,13 +26,15 @@ Context:
 {context}
 """
 
-IMPROVEMENT_PROMPT = """
+IMPROVEMENT_SYSTEM = """
 Based on the analysis results, suggest specific improvements for:
 1. Code structure
 2. Performance
 3. Security
 4. Maintainability
+"""
 
+IMPROVEMENT_ARGS = """
 Analysis Results:
 {analysis_results}
 
@@ -27,12 +42,45 @@ Original Code:
 {code}
 """
 
-SECURITY_PROMPT = """
+SECURITY_SYSTEM = """
 Perform a security analysis of the code focusing on:
 1. Common vulnerabilities
 2. Security best practices
 3. Data handling risks
+"""
 
+SECURITY_ARGS = """
 Code:
 {code}
 """
+
+ANALYSIS_PROMPT = ANALYSIS_SYSTEM + ANALYSIS_ARGS
+
+IMPROVEMENT_PROMPT = IMPROVEMENT_SYSTEM + IMPROVEMENT_ARGS
+
+SECURITY_PROMPT = SECURITY_SYSTEM + SECURITY_ARGS
+
+PROMPT_PREFIXES = (ANALYSIS_SYSTEM, IMPROVEMENT_SYSTEM, SECURITY_SYSTEM)
+
+_ANALYSIS = Template(ANALYSIS_PROMPT.replace("{code}", "${code}").replace("{context}", "${context}"))
+
+_IMPROVEMENT = Template(
+    IMPROVEMENT_PROMPT.replace("{code}", "${code}").replace("{analysis_results}", "${analysis_results}")
+)
+
+_SECURITY = Template(SECURITY_PROMPT.replace("{code}", "${code}"))
+
+
+def render_analysis(code: str, context: str) -> str:
+    """Render the analysis prompt for code and its serialized context."""
+    return _ANALYSIS.substitute(code=code, context=context)
+
+
+def render_improvement(code: str, analysis_results: str) -> str:
+    """Render the improvement prompt for code and its serialized analysis results."""
+    return _IMPROVEMENT.substitute(code=code, analysis_results=analysis_results)
+
+
+def render_security(code: str) -> str:
+    """Render the security analysis prompt for code."""
+    return _SECURITY.substitute(code=code)
@@ -1,6 +1,19 @@
 """AI results validation engine."""
 
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+
+# Read-only, so every engine can share them without copying
+_DEFAULT_POLICIES: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "security": MappingProxyType({
+        "max_severity": "high",
+        "required_checks": ("sql_injection", "xss", "csrf")
+    }),
+    "quality": MappingProxyType({
+        "min_confidence": 0.8,
+        "required_metrics": ("complexity", "maintainability")
+    })
+})
 
 class PolicyEngine:
     """
@@ -30,17 +43,11 @@ class PolicyEngine:
             policy_name: Name of the policy
             policy_rules: Rules for the policy
         """
-        pass
+        if isinstance(self.policies, MappingProxyType):
+            # Copy the shared defaults on first write only
+            self.policies = dict(self.policies)
+        self.policies[policy_name] = policy_rules
         
-    def _load_default_policies(self) -> Dict[str, Any]:
+    def _load_default_policies(self) -> Mapping[str, Mapping[str, Any]]:
         """Load default validation policies."""
-        return {
-            "security": {
-                "max_severity": "high",
-                "required_checks": ["sql_injection", "xss", "csrf"]
-            },
-            "quality": {
-                "min_confidence": 0.8,
-                "required_metrics": ["complexity", "maintainability"]
-            }
-        }
+        return _DEFAULT_POLICIES
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Union
 import logging
 from app.libs.models import IssueBase, ToolName, IssueCategory, IssueSeverity
 from app.libs.utils.process_utils import run_command
@@ -43,7 +43,8 @@ class BaseAnalyzer(ABC):
         """
         pass
 
-    def _run_tool_safely(self, command: List[str], project_path: str, timeout: int = 120) -> tuple[bool, str]:
+    def _run_tool_safely(self, command: List[str], project_path: str, timeout: int = 120,
+                         text: bool = True) -> tuple[bool, Union[str, bytes]]:
         """
         Safely runs the analyzer tool with proper error handling and logging.
 
@@ -51,13 +52,14 @@ class BaseAnalyzer(ABC):
             command: Command to execute (e.g., ["ruff", "check", "."])
             project_path: Directory where to run the command
             timeout: Maximum execution time in seconds
+            text: Decode the tool's stdout; False keeps it as bytes
 
         Returns:
-            tuple[bool, str]: (success, output_or_error)
+            tuple[bool, Union[str, bytes]]: (success, output_or_error)
         """
         self.logger.info(f"Running {self.tool_name.value} analyzer on {project_path}")
 
-        success, output = run_command(command, project_path, timeout)
+        success, output = run_command(command, project_path, timeout, text=text)
 
         if success:
             self.logger.info(f"{self.tool_name.value} completed successfully")
@@ -109,10 +111,12 @@ class BaseAnalyzer(ABC):
         Returns:
             IssueBase: Standardized issue object
         """
-        return IssueBase(
+        # Fields come from our own parsers, so skip per-issue validation and
+        # only coerce the enums that callers may pass as plain strings
+        return IssueBase.model_construct(
             tool=self.tool_name,
-            category=category,
-            severity=severity,
+            category=IssueCategory(category),
+            severity=IssueSeverity(severity),
             title=title,
             description=description,
             file_path=file_path,
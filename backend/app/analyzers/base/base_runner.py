@@ -1,6 +1,9 @@
 """Base runner for isolated code analysis."""
 
+import multiprocessing
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 
 class BaseRunner(ABC):
     """
@@ -17,3 +20,21 @@ class BaseRunner(ABC):
     def run_in_container(self, command: list[str], timeout: int = 300) -> tuple[bool, str]:
         """Run analyzer in an isolated container with timeout."""
         pass
+
+    def run_many(self, commands: list[list[str]], timeout: int = 300) -> list[tuple[bool, str]]:
+        """
+        Run several analyzer commands in parallel, each driven from its own
+        worker process so collecting and decoding one analyzer's output never
+        holds the GIL of another. The runner must be picklable.
+
+        Returns:
+            list[tuple[bool, str]]: Results in the same order as ``commands``
+        """
+        if not commands:
+            return []
+        max_workers = min(len(commands), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("forkserver")
+        ) as executor:
+            return list(executor.map(self.run_in_process, commands, [timeout] * len(commands)))
@@ -1,16 +1,83 @@
+import hashlib
 import json
-from typing import List
+import os
+import sqlite3
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
 from app.libs.models import IssueBase, ToolName
+from app.libs.utils.json_utils import json_loads
 from ..base.base_analyzer import BaseAnalyzer
 
+_DIGIT_STRIP = str.maketrans("", "", "0123456789")
+
+RUFF_SOURCE_EXTENSIONS = ('.py', '.pyi')
+RUFF_SKIP_DIRS = {'.git', '.venv', 'venv', '__pycache__', 'node_modules', '.archon_cache'}
+RUFF_MAX_PATHS_PER_RUN = 500
+RUFF_CONFIG_FILES = {'pyproject.toml', 'ruff.toml', '.ruff.toml'}
+
+_SEVERITY_MAP = {
+    # Error codes
+    "E": "High",    # Error
+    "F": "High",    # Flake8
+    "W": "Medium",  # Warning
+    "C": "Low",     # Convention
+    "B": "High",    # Bug
+    "S": "High",    # Security
+    "A": "Medium",  # Assignment
+    "COM": "Low",   # Commas
+    "D": "Low",     # Docstrings
+    "DTZ": "Low",   # Date/Time
+    "EM": "Medium", # Error Messages
+    "EXE": "High",  # Executable
+    "FA": "Medium", # From __all__
+    "FBT": "Low",   # Boolean Trap
+    "FIX": "High",  # Fixer
+    "FLY": "Low",   # f-strings
+    "G": "Low",     # Logging Format
+    "I": "Low",     # Import
+    "ICN": "Low",   # Import Conventions
+    "INP": "Low",   # Implicit Namespace
+    "ISC": "Low",   # String Concat
+    "N": "Low",     # Naming
+    "PD": "Medium", # Pandas
+    "PGH": "Low",   # Generic
+    "PIE": "Low",   # Miscellaneous
+    "PL": "High",   # Pylint
+    "PT": "High",   # Pytest
+    "PTH": "Low",   # Pathlib
+    "Q": "Low",     # Quotes
+    "RET": "Medium", # Return
+    "RSE": "Medium", # Raise
+    "RUF": "Medium", # Ruff-specific
+    "SIM": "Medium",  # flake8-simplify
+    "TID": "Low",     # flake8-tidy-imports
+    "TCH": "Medium",  # flake8-type-checking
+    "ARG": "Medium",  # flake8-unused-arguments
+    "PTH": "Medium",  # flake8-use-pathlib
+    "ERA": "Low",     # eradicate (commented code)
+    "PD": "Medium",   # pandas-vet
+    "PGH": "High",    # pygrep-hooks
+    "FLY": "Low",     # flynt (f-strings)
+    "NPY": "Medium",  # NumPy-specific
+    "AIR": "Medium",  # Airflow-specific
+}
+
+@lru_cache(maxsize=1)
+def _ruff_version() -> str:
+    """Ruff's version string, resolved once per process"""
+    from app.libs.utils.process_utils import run_command
+    _, version = run_command(["ruff", "--version"], os.getcwd(), timeout=10)
+    return version.strip()
+
 class RuffAnalyzer(BaseAnalyzer):
     """
     Analyzer that uses Ruff to check Python code quality.
     Ruff is a fast Python linter that checks for code style, imports, and common issues.
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
         super().__init__(ToolName.RUFF)
+        self.cache_dir = os.path.abspath(cache_dir or os.getenv("ARCHON_CACHE_DIR", ".archon_cache"))
 
     @property
     def name(self) -> str:
@@ -33,23 +100,185 @@ class RuffAnalyzer(BaseAnalyzer):
             self._log_analysis_result(0, project_path)
             return []
 
-        command = self.get_ruff_command()
-        success, output = self._run_tool_safely(
-            command,
-            project_path,
-            timeout=120
-        )
+        source_files, config_digest = self._collect_source_files(project_path)
+        cache_config = self._get_cache_config(config_digest)
+
+        try:
+            cache = self._open_cache()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Ruff cache unavailable, running without it: {e}")
+            cache = None
+
+        try:
+            ruff_items = []
+            changed = []
+            for rel_path, digest in source_files.items():
+                cached_items = self._cache_lookup(cache, rel_path, digest, cache_config)
+                if cached_items is None:
+                    changed.append(rel_path)
+                else:
+                    ruff_items.extend(
+                        dict(item, filename=os.path.join(project_path, rel_path))
+                        for item in cached_items
+                    )
+
+            if changed:
+                self.logger.info(f"Ruff cache: {len(source_files) - len(changed)} unchanged, {len(changed)} to check")
+                fresh_items = self._run_ruff(project_path, changed)
+                if fresh_items is None:
+                    self._log_analysis_result(0, project_path)
+                    return []
+                ruff_items.extend(fresh_items)
+                self._cache_store(cache, project_path, changed, source_files, fresh_items, cache_config)
+        finally:
+            if cache is not None:
+                cache.close()
+
+        issues = self._items_to_issues(ruff_items)
+        self._log_analysis_result(len(issues), project_path)
+        return issues
 
-        issues = []
-        if success:
+    def _run_ruff(self, project_path: str, paths: List[str]) -> Optional[List[dict]]:
+        """
+        Runs Ruff on an explicit list of files, in chunks to stay within
+        command-line length limits.
+
+        Args:
+            project_path: Path to the project directory
+            paths: Project-relative files to check
+
+        Returns:
+            Optional[List[dict]]: Raw Ruff items, or None if Ruff failed
+        """
+        items = []
+        for start in range(0, len(paths), RUFF_MAX_PATHS_PER_RUN):
+            command = self.get_ruff_command(paths[start:start + RUFF_MAX_PATHS_PER_RUN])
+            success, output = self._run_tool_safely(
+                command,
+                project_path,
+                timeout=120,
+                text=False
+            )
+            if not success:
+                return None
             try:
-                issues = self._parse_ruff_output(output)
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                if output and not output.isspace():
+                    items.extend(json_loads(output))
+            except (json.JSONDecodeError, TypeError) as e:
                 self.logger.error(f"Failed to parse Ruff output: {e}")
-                issues = []
+                return None
+        return items
 
-        self._log_analysis_result(len(issues), project_path)
-        return issues
+    def _collect_source_files(self, project_path: str) -> Tuple[Dict[str, str], str]:
+        """
+        Finds Python sources Ruff would check and hashes their contents,
+        along with every Ruff configuration file in the project.
+
+        Args:
+            project_path: Path to the project directory
+
+        Returns:
+            Tuple[Dict[str, str], str]: Project-relative path -> content digest,
+            and a combined digest of the project's Ruff configuration files
+        """
+        source_files = {}
+        config_hash = hashlib.blake2b(digest_size=16)
+        config_files = []
+        for root, dirs, files in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in RUFF_SKIP_DIRS]
+            for file in files:
+                is_config = file in RUFF_CONFIG_FILES
+                if not is_config and not file.endswith(RUFF_SOURCE_EXTENSIONS):
+                    continue
+                file_path = os.path.join(root, file)
+                try:
+                    with open(file_path, 'rb') as f:
+                        content = f.read()
+                except OSError:
+                    continue
+                rel_path = os.path.relpath(file_path, project_path)
+                if is_config:
+                    config_files.append((rel_path, content))
+                else:
+                    source_files[rel_path] = hashlib.blake2b(content, digest_size=16).hexdigest()
+        for rel_path, content in sorted(config_files):
+            config_hash.update(rel_path.encode())
+            config_hash.update(b"\0")
+            config_hash.update(content)
+        return source_files, config_hash.hexdigest()
+
+    def _get_cache_config(self, config_digest: str) -> str:
+        """
+        Identifies the Ruff version, rule set and project configuration, so
+        cached results are invalidated whenever any of them changes.
+
+        Args:
+            config_digest: Digest of the project's Ruff configuration files
+
+        Returns:
+            str: Cache configuration key
+        """
+        return f"{_ruff_version()}|{' '.join(self.get_ruff_command([]))}|{config_digest}"
+
+    def _open_cache(self) -> sqlite3.Connection:
+        """
+        Opens the persistent per-file Ruff results cache.
+
+        Returns:
+            sqlite3.Connection: Cache connection in WAL mode
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.cache_dir, "ruff.sqlite"), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ruff_results ("
+            "path TEXT, digest TEXT, config TEXT, items BLOB, "
+            "PRIMARY KEY (path, digest, config))"
+        )
+        return conn
+
+    def _cache_lookup(self, cache: Optional[sqlite3.Connection], rel_path: str,
+                      digest: str, cache_config: str) -> Optional[List[dict]]:
+        """
+        Returns cached Ruff items for an unchanged file.
+
+        Returns:
+            Optional[List[dict]]: Cached items, or None on a cache miss
+        """
+        if cache is None:
+            return None
+        row = cache.execute(
+            "SELECT items FROM ruff_results WHERE path = ? AND digest = ? AND config = ?",
+            (rel_path, digest, cache_config)
+        ).fetchone()
+        return json_loads(row[0]) if row else None
+
+    def _cache_store(self, cache: Optional[sqlite3.Connection], project_path: str,
+                     checked: List[str], source_files: Dict[str, str],
+                     ruff_items: List[dict], cache_config: str) -> None:
+        """
+        Stores fresh Ruff items per checked file, including files with no issues.
+        """
+        if cache is None:
+            return
+
+        items_by_file = {rel_path: [] for rel_path in checked}
+        for item in ruff_items:
+            rel_path = os.path.relpath(item.get("filename", ""), project_path)
+            if rel_path in items_by_file:
+                items_by_file[rel_path].append(item)
+
+        try:
+            with cache:
+                cache.executemany(
+                    "INSERT OR REPLACE INTO ruff_results (path, digest, config, items) VALUES (?, ?, ?, ?)",
+                    [
+                        (rel_path, source_files[rel_path], cache_config, json.dumps(items))
+                        for rel_path, items in items_by_file.items()
+                    ]
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to update Ruff cache: {e}")
 
     def _is_ruff_available(self) -> bool:
         """
@@ -61,20 +290,31 @@ class RuffAnalyzer(BaseAnalyzer):
         from app.libs.utils.process_utils import is_tool_available
         return is_tool_available("ruff")
 
-    def _parse_ruff_output(self, output: str) -> List[IssueBase]:
+    def _parse_ruff_output(self, output: Union[str, bytes]) -> List[IssueBase]:
         """
         Parses Ruff JSON output and converts it to standardized IssueBase objects.
 
         Args:
-            output: JSON string output from Ruff
+            output: JSON output from Ruff, as str or raw UTF-8 bytes
 
         Returns:
             List[IssueBase]: List of parsed issues
         """
-        if not output.strip():
+        if not output or output.isspace():
             return []
 
-        ruff_data = json.loads(output)
+        return self._items_to_issues(json_loads(output))
+
+    def _items_to_issues(self, ruff_data: List[dict]) -> List[IssueBase]:
+        """
+        Converts raw Ruff items to standardized IssueBase objects.
+
+        Args:
+            ruff_data: Decoded Ruff JSON items
+
+        Returns:
+            List[IssueBase]: List of parsed issues
+        """
         issues = []
 
         for item in ruff_data:
@@ -109,56 +349,8 @@ class RuffAnalyzer(BaseAnalyzer):
         Returns:
             str: Mapped severity level
         """
-        severity_map = {
-            # Error codes
-            "E": "High",    # Error
-            "F": "High",    # Flake8
-            "W": "Medium",  # Warning
-            "C": "Low",     # Convention
-            "B": "High",    # Bug
-            "S": "High",    # Security
-            "A": "Medium",  # Assignment
-            "COM": "Low",   # Commas
-            "D": "Low",     # Docstrings
-            "DTZ": "Low",   # Date/Time
-            "EM": "Medium", # Error Messages
-            "EXE": "High",  # Executable
-            "FA": "Medium", # From __all__
-            "FBT": "Low",   # Boolean Trap
-            "FIX": "High",  # Fixer
-            "FLY": "Low",   # f-strings
-            "G": "Low",     # Logging Format
-            "I": "Low",     # Import
-            "ICN": "Low",   # Import Conventions
-            "INP": "Low",   # Implicit Namespace
-            "ISC": "Low",   # String Concat
-            "N": "Low",     # Naming
-            "PD": "Medium", # Pandas
-            "PGH": "Low",   # Generic
-            "PIE": "Low",   # Miscellaneous
-            "PL": "High",   # Pylint
-            "PT": "High",   # Pytest
-            "PTH": "Low",   # Pathlib
-            "Q": "Low",     # Quotes
-            "RET": "Medium", # Return
-            "RSE": "Medium", # Raise
-            "RUF": "Medium", # Ruff-specific
-            "SIM": "Medium",  # flake8-simplify
-            "TID": "Low",     # flake8-tidy-imports
-            "TCH": "Medium",  # flake8-type-checking
-            "ARG": "Medium",  # flake8-unused-arguments
-            "PTH": "Medium",  # flake8-use-pathlib
-            "ERA": "Low",     # eradicate (commented code)
-            "PD": "Medium",   # pandas-vet
-            "PGH": "High",    # pygrep-hooks
-            "FLY": "Low",     # flynt (f-strings)
-            "NPY": "Medium",  # NumPy-specific
-            "AIR": "Medium",  # Airflow-specific
-        }
-
-        # Get first letter/characters before numbers
-        code_prefix = ''.join(c for c in code if not c.isdigit())
-        return severity_map.get(code_prefix, "Low")
+        code_prefix = code.translate(_DIGIT_STRIP)
+        return _SEVERITY_MAP.get(code_prefix, "Low")
 
     def _create_description(self, item: dict) -> str:
         """
@@ -194,18 +386,22 @@ class RuffAnalyzer(BaseAnalyzer):
 
         return " | ".join(description_parts)
 
-    def get_ruff_command(self) -> List[str]:
+    def get_ruff_command(self, paths: Optional[List[str]] = None) -> List[str]:
         """
         Builds comprehensive Ruff command with extensive rule coverage.
+        Ruff's own cache is kept in the persistent cache directory.
+
+        Args:
+            paths: Files to check (defaults to the whole project)
 
         Returns:
             List[str]: Complete Ruff command with all enabled rules
         """
         command = [
-            "ruff", "check", ".",
+            "ruff", "check", *(["."] if paths is None else paths),
             "--output-format=json",
             "--force-exclude",
-            "--no-cache",
+            "--cache-dir", os.path.join(self.cache_dir, "ruff"),
             "--select=ALL",  # Enable all available rules
             "--ignore=D100,D101,D102,D103,D104,D105,D106,D107",  # Ignore some docstring rules
             "--ignore=D203,D211,D212,D213",  # Ignore conflicting docstring rules
@@ -1,21 +1,63 @@
-"""JSCPD analyzer for code duplication detection."""
+"""JSCPD-style analyzer for code duplication detection."""
 
-import json
+import io
 import os
-import tempfile
-from typing import List
+import tokenize
+from typing import Dict, List, Tuple
+import numpy as np
 from app.libs.models import IssueBase, ToolName, IssueCategory, IssueSeverity, StructureMetrics
 from ..base.base_analyzer import BaseAnalyzer
 
+DUPLICATION_MIN_LINES = 5
+DUPLICATION_MIN_TOKENS = 50
+DUPLICATION_SKIP_DIRS = {'.git', '.venv', 'venv', '__pycache__', 'node_modules', '.archon_cache'}
+
+# Tokens that carry layout only; jscpd ignores them as well
+_SKIPPED_TOKEN_TYPES = {
+    tokenize.ENCODING, tokenize.ENDMARKER, tokenize.COMMENT,
+    tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT,
+}
+
+# Odd base, so it is invertible modulo 2**64 and window hashes can be
+# computed from prefix sums without a sequential rolling loop
+_HASH_BASE = np.uint64(0x100000001B3)
+_HASH_BASE_INV = np.uint64(pow(int(_HASH_BASE), -1, 2 ** 64))
+
+
+def _powers(base: np.uint64, count: int) -> np.ndarray:
+    """base**0 .. base**(count - 1), wrapping modulo 2**64."""
+    powers = np.ones(count, dtype=np.uint64)
+    if count > 1:
+        powers[1:] = np.cumprod(np.full(count - 1, base, dtype=np.uint64))
+    return powers
+
+
+def _window_hashes(token_ids: np.ndarray, window: int) -> np.ndarray:
+    """
+    64-bit polynomial hash of every run of ``window`` consecutive tokens.
+
+    The prefix sum of ``id * base**t`` gives each window's hash scaled by
+    ``base**start``; multiplying by the inverse power removes the offset so
+    equal token runs hash equally wherever they appear.
+    """
+    count = len(token_ids)
+    prefix = np.zeros(count + 1, dtype=np.uint64)
+    np.cumsum(token_ids * _powers(_HASH_BASE, count), out=prefix[1:])
+    return (prefix[window:] - prefix[:-window]) * _powers(_HASH_BASE_INV, count - window + 1)
+
 
 class JSCPDAnalyzer(BaseAnalyzer):
     """
-    Analyzer that uses JSCPD to detect code duplications.
-    Supports multiple programming languages.
+    Analyzer that detects code duplications the way JSCPD does, in process.
+    Python files are tokenized, every window of ``min_tokens`` tokens is
+    fingerprinted, and overlapping matching windows are merged into
+    duplicated blocks.
     """
 
-    def __init__(self):
+    def __init__(self, min_lines: int = DUPLICATION_MIN_LINES, min_tokens: int = DUPLICATION_MIN_TOKENS):
         super().__init__(ToolName.JSCPD)
+        self.min_lines = min_lines
+        self.min_tokens = min_tokens
 
     @property
     def name(self) -> str:
@@ -23,7 +65,7 @@ class JSCPDAnalyzer(BaseAnalyzer):
 
     def analyze(self, project_path: str) -> List[IssueBase]:
         """
-        Analyzes project using JSCPD for code duplication.
+        Analyzes project for code duplication.
         
         Args:
             project_path: Path to the project directory
@@ -35,99 +77,197 @@ class JSCPDAnalyzer(BaseAnalyzer):
         issues = []
 
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # jscpd uses output as directory, not file
-                command = [
-                    "npx", "jscpd",
-                    ".",
-                    "--reporters", "json",
-                    "--output", temp_dir,
-                    "--min-lines", "5",
-                    "--min-tokens", "50",
-                    "--threshold", "100",  # Increase threshold to avoid threshold error
-                    "--format", "python"
-                ]
-                
-                success = self._run_tool_safely(command, project_path)
-                
-                # jscpd creates jscpd-report.json in the output directory
-                output_file = os.path.join(temp_dir, "jscpd-report.json")
-                if success and os.path.exists(output_file):
-                    issues = self._parse_jscpd_output(output_file)
-                    
+            files = self._tokenize_project(project_path)
+            issues = self._duplicates_to_issues(self._find_duplicates(files))
         except Exception as e:
             self.logger.error(f"JSCPD analysis failed: {str(e)}")
             
         self._log_analysis_result(len(issues), project_path)
         return issues
 
-    def _parse_jscpd_output(self, output_file: str) -> List[IssueBase]:
-        """Parse JSCPD JSON output and create issues"""
+    def _tokenize_project(self, project_path: str) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+        """
+        Tokenize every Python file of the project.
+
+        Args:
+            project_path: Path to the project directory
+
+        Returns:
+            (relative path, token ids, token start lines) per file with at
+            least ``min_tokens`` tokens; ids are shared across files
+        """
+        vocabulary: Dict[str, int] = {}
+        files = []
+
+        for root, dirs, filenames in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in DUPLICATION_SKIP_DIRS]
+            for filename in filenames:
+                if not filename.endswith('.py'):
+                    continue
+                full_path = os.path.join(root, filename)
+                try:
+                    with open(full_path, 'rb') as f:
+                        tokens = [
+                            token for token in tokenize.tokenize(io.BytesIO(f.read()).readline)
+                            if token.type not in _SKIPPED_TOKEN_TYPES
+                        ]
+                except (OSError, SyntaxError, tokenize.TokenError) as e:
+                    self.logger.debug(f"Skipping {full_path}: {e}")
+                    continue
+
+                if len(tokens) < self.min_tokens:
+                    continue
+
+                token_ids = np.fromiter(
+                    (vocabulary.setdefault(token.string, len(vocabulary) + 1) for token in tokens),
+                    dtype=np.uint64, count=len(tokens)
+                )
+                lines = np.fromiter((token.start[0] for token in tokens), dtype=np.int64, count=len(tokens))
+                files.append((os.path.relpath(full_path, project_path), token_ids, lines))
+
+        return files
+
+    def _find_duplicates(self, files: List[Tuple[str, np.ndarray, np.ndarray]]) -> List[dict]:
+        """
+        Find duplicated token runs across and within files.
+
+        Only hashes seen more than once are revisited: every later occurrence
+        is paired with the first one, and pairs that continue on the same
+        diagonal are merged into a single duplicated block.
+
+        Args:
+            files: Output of ``_tokenize_project``
+
+        Returns:
+            Duplicates in JSCPD report shape (``firstFile``, ``secondFile``,
+            ``lines``, ``tokens``)
+        """
+        if not files:
+            return []
+
+        window = self.min_tokens
+        hashes = np.concatenate([_window_hashes(ids, window) for _, ids, _ in files])
+        file_index = np.concatenate([
+            np.full(len(ids) - window + 1, i, dtype=np.int64) for i, (_, ids, _) in enumerate(files)
+        ])
+        position = np.concatenate([np.arange(len(ids) - window + 1, dtype=np.int64) for _, ids, _ in files])
+
+        _, inverse, counts = np.unique(hashes, return_inverse=True, return_counts=True)
+        colliding = counts[inverse] > 1
+        if not colliding.any():
+            return []
+        hashes, file_index, position = hashes[colliding], file_index[colliding], position[colliding]
+
+        order = np.lexsort((position, file_index, hashes))
+        hashes, file_index, position = hashes[order], file_index[order], position[order]
+
+        # Index of the first occurrence of each element's hash
+        group_start = np.r_[True, hashes[1:] != hashes[:-1]]
+        anchor = np.maximum.accumulate(np.where(group_start, np.arange(len(hashes)), 0))
+
+        first_file, first_pos = file_index[anchor], position[anchor]
+        keep = ~group_start & ((first_file != file_index) | (position - first_pos >= window))
+        first_file, first_pos = first_file[keep], first_pos[keep]
+        second_file, second_pos = file_index[keep], position[keep]
+        if not len(first_file):
+            return []
+
+        diagonal = second_pos - first_pos
+        order = np.lexsort((first_pos, diagonal, second_file, first_file))
+        first_file, first_pos = first_file[order], first_pos[order]
+        second_file, second_pos = second_file[order], second_pos[order]
+        diagonal = diagonal[order]
+
+        run_start = np.r_[True, (
+            (first_file[1:] != first_file[:-1])
+            | (second_file[1:] != second_file[:-1])
+            | (diagonal[1:] != diagonal[:-1])
+            | (first_pos[1:] != first_pos[:-1] + 1)
+        )]
+        starts = np.flatnonzero(run_start)
+        ends = np.r_[starts[1:], len(run_start)] - 1
+
+        duplicates = []
+        for start, end in zip(starts, ends):
+            first_path, _, first_lines = files[first_file[start]]
+            second_path, _, second_lines = files[second_file[start]]
+            tokens_count = int(first_pos[end] - first_pos[start]) + window
+            first_start = int(first_lines[first_pos[start]])
+            first_end = int(first_lines[first_pos[end] + window - 1])
+            second_start = int(second_lines[second_pos[start]])
+            second_end = int(second_lines[second_pos[end] + window - 1])
+
+            lines_count = first_end - first_start + 1
+            if lines_count < self.min_lines:
+                continue
+
+            duplicates.append({
+                'firstFile': {'name': first_path, 'start': first_start, 'end': first_end},
+                'secondFile': {'name': second_path, 'start': second_start, 'end': second_end},
+                'lines': lines_count,
+                'tokens': tokens_count,
+            })
+
+        return duplicates
+
+    def _duplicates_to_issues(self, duplicates: List[dict]) -> List[IssueBase]:
+        """Create a pair of issues for every duplicated block"""
         issues = []
         
-        try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            duplicates = data.get('duplicates', [])
+        for duplicate in duplicates:
+            first_file = duplicate.get('firstFile', {})
+            second_file = duplicate.get('secondFile', {})
             
-            for duplicate in duplicates:
-                first_file = duplicate.get('firstFile', {})
-                second_file = duplicate.get('secondFile', {})
-                
-                first_path = first_file.get('name', '')
-                second_path = second_file.get('name', '')
-                
-                if not first_path or not second_path:
-                    continue
-                    
-                lines_count = duplicate.get('lines', 0)
-                tokens_count = duplicate.get('tokens', 0)
-                
-                severity = self._get_duplication_severity(lines_count, tokens_count)
-                
-                issue1 = self._create_issue(
-                    category=IssueCategory.STRUCTURE,
-                    severity=severity,
-                    title=f"Code duplication: {lines_count} lines",
-                    description=f"Duplicated code found with {second_path}. "
-                               f"{lines_count} lines, {tokens_count} tokens duplicated.",
-                    file_path=first_path,
-                    line_number=first_file.get('start', 1),
-                    start_line=first_file.get('start', 1),
-                    end_line=first_file.get('end', first_file.get('start', 1))
-                )
-                
-                issue1.metrics = StructureMetrics(
-                    duplicate_tokens=tokens_count,
-                    sloc=lines_count,
-                    duplicate_files=[second_path]
-                )
-                
-                issues.append(issue1)
-                
-                issue2 = self._create_issue(
-                    category=IssueCategory.STRUCTURE,
-                    severity=severity,
-                    title=f"Code duplication: {lines_count} lines",
-                    description=f"Duplicated code found with {first_path}. "
-                               f"{lines_count} lines, {tokens_count} tokens duplicated.",
-                    file_path=second_path,
-                    line_number=second_file.get('start', 1),
-                    start_line=second_file.get('start', 1),
-                    end_line=second_file.get('end', second_file.get('start', 1))
-                )
-                
-                issue2.metrics = StructureMetrics(
-                    duplicate_tokens=tokens_count,
-                    sloc=lines_count,
-                    duplicate_files=[first_path]
-                )
-                
-                issues.append(issue2)
+            first_path = first_file.get('name', '')
+            second_path = second_file.get('name', '')
+            
+            if not first_path or not second_path:
+                continue
                 
-        except (json.JSONDecodeError, FileNotFoundError, KeyError) as e:
-            self.logger.error(f"Failed to parse JSCPD output: {e}")
+            lines_count = duplicate.get('lines', 0)
+            tokens_count = duplicate.get('tokens', 0)
+            
+            severity = self._get_duplication_severity(lines_count, tokens_count)
+            
+            issue1 = self._create_issue(
+                category=IssueCategory.STRUCTURE,
+                severity=severity,
+                title=f"Code duplication: {lines_count} lines",
+                description=f"Duplicated code found with {second_path}. "
+                           f"{lines_count} lines, {tokens_count} tokens duplicated.",
+                file_path=first_path,
+                line_number=first_file.get('start', 1),
+                start_line=first_file.get('start', 1),
+                end_line=first_file.get('end', first_file.get('start', 1))
+            )
+            
+            issue1.metrics = StructureMetrics(
+                duplicate_tokens=tokens_count,
+                sloc=lines_count,
+                duplicate_files=[second_path]
+            )
+            
+            issues.append(issue1)
+            
+            issue2 = self._create_issue(
+                category=IssueCategory.STRUCTURE,
+                severity=severity,
+                title=f"Code duplication: {lines_count} lines",
+                description=f"Duplicated code found with {first_path}. "
+                           f"{lines_count} lines, {tokens_count} tokens duplicated.",
+                file_path=second_path,
+                line_number=second_file.get('start', 1),
+                start_line=second_file.get('start', 1),
+                end_line=second_file.get('end', second_file.get('start', 1))
+            )
+            
+            issue2.metrics = StructureMetrics(
+                duplicate_tokens=tokens_count,
+                sloc=lines_count,
+                duplicate_files=[first_path]
+            )
+            
+            issues.append(issue2)
             
         return issues
 
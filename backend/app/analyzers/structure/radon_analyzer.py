@@ -1,10 +1,15 @@
 """Radon analyzer for code complexity metrics."""
 
-import json
-from typing import List
+import os
+from typing import Iterator, List, Tuple
+from radon.complexity import cc_visit
+from radon.metrics import mi_visit
+from radon.raw import analyze as raw_analyze
 from app.libs.models import IssueBase, ToolName, IssueCategory, IssueSeverity, StructureMetrics
 from ..base.base_analyzer import BaseAnalyzer
 
+RADON_SKIP_DIRS = {'.git', '.venv', 'venv', '__pycache__', 'node_modules', '.archon_cache'}
+
 
 class RadonAnalyzer(BaseAnalyzer):
     """
@@ -33,14 +38,13 @@ class RadonAnalyzer(BaseAnalyzer):
         issues = []
 
         try:
-            cc_issues = self._analyze_cyclomatic_complexity(project_path)
-            issues.extend(cc_issues)
-
-            mi_issues = self._analyze_maintainability_index(project_path)
-            issues.extend(mi_issues)
+            sources = list(self._iter_py_files(project_path))
 
-            raw_issues = self._analyze_raw_metrics(project_path)
-            issues.extend(raw_issues)
+            # Radon's visitors are pure Python and hold the GIL, so the passes
+            # run in turn; the engine already overlaps Radon with the other analyzers
+            issues.extend(self._analyze_cyclomatic_complexity(sources))
+            issues.extend(self._analyze_maintainability_index(sources))
+            issues.extend(self._analyze_raw_metrics(sources))
 
         except Exception as e:
             self.logger.error(f"Radon analysis failed: {str(e)}")
@@ -48,119 +52,125 @@ class RadonAnalyzer(BaseAnalyzer):
         self._log_analysis_result(len(issues), project_path)
         return issues
 
-    def _analyze_cyclomatic_complexity(self, project_path: str) -> List[IssueBase]:
-        """Analyze cyclomatic complexity using radon cc"""
-        issues = []
+    def _iter_py_files(self, project_path: str) -> Iterator[Tuple[str, str]]:
+        """
+        Walks the project once, yielding every Python source file.
 
-        command = ["radon", "cc", ".", "--json", "--average"]
-        success, output = self._run_tool_safely(command, project_path)
-        
-        if not success:
-            return issues
-            
-        try:
-            cc_data = json.loads(output)
-            for file_path, functions in cc_data.items():
-                if isinstance(functions, list):
-                    for func_data in functions:
-                        complexity = func_data.get('complexity', 0)
-                        if complexity >= 10:
-                            severity = self._get_complexity_severity(complexity)
-                            
-                            issue = self._create_issue(
-                                category=IssueCategory.STRUCTURE,
-                                severity=severity,
-                                title=f"High cyclomatic complexity: {complexity}",
-                                description=f"Function '{func_data.get('name')}' has complexity {complexity}. Consider refactoring.",
-                                file_path=file_path,
-                                line_number=func_data.get('lineno', 1),
-                                start_line=func_data.get('lineno', 1),
-                                end_line=func_data.get('endline', func_data.get('lineno', 1))
-                            )
-
-                            issue.metrics = StructureMetrics(
-                                cyclomatic_complexity=complexity
-                            )
-                            
-                            issues.append(issue)
-                            
-        except (json.JSONDecodeError, KeyError) as e:
-            self.logger.error(f"Failed to parse Radon CC output: {e}")
-            
-        return issues
+        Args:
+            project_path: Path to the project directory
 
-    def _analyze_maintainability_index(self, project_path: str) -> List[IssueBase]:
-        """Analyze maintainability index using radon mi"""
+        Yields:
+            (project-relative path, source text) pairs
+        """
+        for root, dirs, files in os.walk(project_path):
+            dirs[:] = [d for d in dirs if d not in RADON_SKIP_DIRS and not d.startswith('.')]
+            for file in files:
+                if not file.endswith('.py'):
+                    continue
+                file_path = os.path.join(root, file)
+                try:
+                    with open(file_path, 'rb') as f:
+                        source = f.read().decode('utf-8', errors='replace')
+                except OSError as e:
+                    self.logger.debug(f"Skipping unreadable file {file_path}: {e}")
+                    continue
+                yield os.path.relpath(file_path, project_path), source
+
+    def _analyze_cyclomatic_complexity(self, sources: List[Tuple[str, str]]) -> List[IssueBase]:
+        """Analyze cyclomatic complexity using radon's cc visitor"""
         issues = []
-        
-        command = ["radon", "mi", ".", "--json"]
-        success, output = self._run_tool_safely(command, project_path)
-        
-        if not success:
-            return issues
-            
-        try:
-            mi_data = json.loads(output)
-            for file_path, mi_value in mi_data.items():
-                if isinstance(mi_value, (int, float)) and mi_value < 60:
-                    severity = self._get_maintainability_severity(mi_value)
-                    
+
+        for file_path, source in sources:
+            try:
+                blocks = cc_visit(source)
+            except (SyntaxError, ValueError) as e:
+                self.logger.debug(f"Radon CC skipped {file_path}: {e}")
+                continue
+
+            for block in blocks:
+                complexity = block.complexity
+                if complexity >= 10:
+                    severity = self._get_complexity_severity(complexity)
+
                     issue = self._create_issue(
                         category=IssueCategory.STRUCTURE,
                         severity=severity,
-                        title=f"Low maintainability index: {mi_value:.2f}",
-                        description=f"File has low maintainability index {mi_value:.2f}. Consider refactoring.",
+                        title=f"High cyclomatic complexity: {complexity}",
+                        description=f"Function '{block.name}' has complexity {complexity}. Consider refactoring.",
                         file_path=file_path,
-                        line_number=1
+                        line_number=block.lineno,
+                        start_line=block.lineno,
+                        end_line=block.endline or block.lineno
                     )
-                    
+
                     issue.metrics = StructureMetrics(
-                        maintainability_index=mi_value
+                        cyclomatic_complexity=complexity
                     )
-                    
+
                     issues.append(issue)
-                    
-        except (json.JSONDecodeError, KeyError) as e:
-            self.logger.error(f"Failed to parse Radon MI output: {e}")
-            
+
         return issues
 
-    def _analyze_raw_metrics(self, project_path: str) -> List[IssueBase]:
-        """Analyze raw metrics using radon raw"""
+    def _analyze_maintainability_index(self, sources: List[Tuple[str, str]]) -> List[IssueBase]:
+        """Analyze maintainability index using radon's mi visitor"""
         issues = []
-        
-        command = ["radon", "raw", ".", "--json"]
-        success, output = self._run_tool_safely(command, project_path)
-        
-        if not success:
-            return issues
-            
-        try:
-            raw_data = json.loads(output)
-            for file_path, metrics in raw_data.items():
-                sloc = metrics.get('sloc', 0)
 
-                if sloc > 200:
-                    severity = IssueSeverity.MEDIUM if sloc < 500 else IssueSeverity.HIGH
-                    
-                    issue = self._create_issue(
-                        category=IssueCategory.STRUCTURE,
-                        severity=severity,
-                        title=f"Large file: {sloc} lines",
-                        description=f"File has {sloc} lines of code. Consider splitting into smaller modules.",
-                        file_path=file_path,
-                        line_number=1
-                    )
-                    
-                    issue.metrics = StructureMetrics(
-                        sloc=sloc
-                    )
-                    
-                    issues.append(issue)
-                    
-        except (json.JSONDecodeError, KeyError) as e:
-            self.logger.error(f"Failed to parse Radon raw output: {e}")
-            
+        for file_path, source in sources:
+            try:
+                mi_value = mi_visit(source, multi=True)
+            except (SyntaxError, ValueError) as e:
+                self.logger.debug(f"Radon MI skipped {file_path}: {e}")
+                continue
+
+            if mi_value < 60:
+                severity = self._get_maintainability_severity(mi_value)
+
+                issue = self._create_issue(
+                    category=IssueCategory.STRUCTURE,
+                    severity=severity,
+                    title=f"Low maintainability index: {mi_value:.2f}",
+                    description=f"File has low maintainability index {mi_value:.2f}. Consider refactoring.",
+                    file_path=file_path,
+                    line_number=1
+                )
+
+                issue.metrics = StructureMetrics(
+                    maintainability_index=mi_value
+                )
+
+                issues.append(issue)
+
+        return issues
+
+    def _analyze_raw_metrics(self, sources: List[Tuple[str, str]]) -> List[IssueBase]:
+        """Analyze raw metrics using radon's raw analyzer"""
+        issues = []
+
+        for file_path, source in sources:
+            try:
+                sloc = raw_analyze(source).sloc
+            except (SyntaxError, ValueError) as e:
+                self.logger.debug(f"Radon raw skipped {file_path}: {e}")
+                continue
+
+            if sloc > 200:
+                severity = IssueSeverity.MEDIUM if sloc < 500 else IssueSeverity.HIGH
+
+                issue = self._create_issue(
+                    category=IssueCategory.STRUCTURE,
+                    severity=severity,
+                    title=f"Large file: {sloc} lines",
+                    description=f"File has {sloc} lines of code. Consider splitting into smaller modules.",
+                    file_path=file_path,
+                    line_number=1
+                )
+
+                issue.metrics = StructureMetrics(
+                    sloc=sloc
+                )
+
+                issues.append(issue)
+
         return issues
 
     def _get_complexity_severity(self, complexity: float) -> IssueSeverity:
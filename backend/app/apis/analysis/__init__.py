@@ -1,37 +1,46 @@
 from fastapi import APIRouter
-import os
-import asyncpg
-import json
+import asyncio
+import logging
 import tempfile
 import shutil
-import subprocess
-from datetime import datetime
-from app.libs.analysis_engine import run_analysis
+from pathlib import Path
+from app.libs.analysis_cache import get_cached_report, store_cached_report
+from app.libs.analysis_engine import run_analysis_async
+from app.libs.database import get_app_db_pool
+from app.libs.utils.file_utils import has_any_code_file
+from app.libs.utils.git_utils import clone_repository_async, get_head_sha
+from app.libs.utils.json_utils import json_dumps
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-async def get_db_connection():
-    """Get database connection"""
-    db_url = os.getenv("DATABASE_URL_DEV")
-    if not db_url:
-        raise ValueError("DATABASE_URL_DEV not found in environment variables")
-    return await asyncpg.connect(db_url)
+UPDATE_RUNNING_SQL = "UPDATE analyses SET status = 'running' WHERE id = $1"
+
+FETCH_PROJECT_SQL = "SELECT repo_url, repo_name FROM projects WHERE id = $1"
+
+UPDATE_COMPLETED_SQL = """
+    UPDATE analyses SET
+        status = 'completed',
+        completed_at = NOW(),
+        overall_score = $1,
+        structure_score = $2,
+        quality_score = $3,
+        security_score = $4
+    WHERE id = $5
+"""
+
+UPDATE_FAILED_SQL = "UPDATE analyses SET status = 'failed' WHERE id = $1"
 
 async def run_real_analysis(project_id: int, analysis_id: int):
     """Run real analysis using the analysis engine"""
-    conn = None
+    pool = None
     project_path = None
     try:
-        conn = await get_db_connection()
-        await conn.execute(
-            "UPDATE analyses SET status = 'running' WHERE id = $1",
-            analysis_id
-        )
-
-        project = await conn.fetchrow(
-            "SELECT repo_url, repo_name FROM projects WHERE id = $1",
-            project_id
-        )
+        pool = await get_app_db_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.execute(UPDATE_RUNNING_SQL, analysis_id)
+            project = await conn.fetchrow(FETCH_PROJECT_SQL, project_id)
 
         if not project:
             raise Exception(f"Project {project_id} not found")
@@ -39,44 +48,13 @@ async def run_real_analysis(project_id: int, analysis_id: int):
         repo_url = project['repo_url']
         project_path = tempfile.mkdtemp()
 
-        try:
-            subprocess.run(
-                ["git", "clone", repo_url, project_path],
-                check=True,
-                capture_output=True,
-                timeout=300
-            )
-        except subprocess.TimeoutExpired:
-            raise Exception("Repository cloning timed out")
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Failed to clone repository: {e}")
+        await clone_repository_async(repo_url, project_path)
 
         try:
-            import os
-            all_files = []
-            for root, dirs, files in os.walk(project_path):
-                if '.git' in dirs:
-                    dirs.remove('.git')
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, project_path)
-                    all_files.append(rel_path.lower())
-
-            docs_extensions = {'.md', '.txt', '.rst', '.pdf', '.doc', '.docx'}
-            config_files = {'license', 'changelog', 'authors', 'contributors', 'copying', 'install', 'news', 'readme'}
-
-            code_files = []
-            for file_path in all_files:
-                file_name = os.path.basename(file_path).lower()
-                file_ext = os.path.splitext(file_name)[1]
-                file_base = os.path.splitext(file_name)[0]
-
-                if file_ext in docs_extensions or file_base in config_files or '.git' in file_path:
-                    continue
-                code_files.append(file_path)
-
-            if len(code_files) == 0:
-                print(f"📄 Repository is empty or contains only documentation - assigning perfect scores")
+            has_code = await asyncio.to_thread(has_any_code_file, project_path)
+
+            if not has_code:
+                logger.info("Repository is empty or contains only documentation - assigning perfect scores")
                 report = {
                     "overall_score": 100.0,
                     "structure_score": 100.0,
@@ -85,12 +63,18 @@ async def run_real_analysis(project_id: int, analysis_id: int):
                     "issues": []
                 }
             else:
-                print(f"🔍 Repository contains {len(code_files)} code files - running analysis")
-                report = run_analysis(project_path)
-                print(f"✅ Analysis completed for project {project_id}: Overall score {report.get('overall_score', 'N/A')}")
+                commit_sha = await asyncio.to_thread(get_head_sha, project_path)
+                report = await get_cached_report(commit_sha)
+                if report is None:
+                    logger.info("Repository contains code files - running analysis")
+                    report = await run_analysis_async(project_path)
+                    await store_cached_report(commit_sha, report)
+                else:
+                    logger.info("Reusing cached analysis of commit %s", commit_sha)
+                logger.info("Analysis completed for project %s: Overall score %s", project_id, report.get('overall_score', 'N/A'))
 
         except Exception as analysis_error:
-            print(f"❌ Analysis failed for project {project_id}: {analysis_error}")
+            logger.error("Analysis failed for project %s: %s", project_id, analysis_error)
             report = {
                 "overall_score": 100.0,
                 "structure_score": 100.0,
@@ -98,29 +82,18 @@ async def run_real_analysis(project_id: int, analysis_id: int):
                 "security_score": 100.0,
                 "issues": []
             }
-            print(f"✅ Created fallback perfect score report for project {project_id}")
+            logger.info("Created fallback perfect score report for project %s", project_id)
 
         report_file_path = f"analysis_reports/analysis_report_{project_id}.json"
-        with open(report_file_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(Path(report_file_path).write_bytes, json_dumps(report))
 
         overall_score = report['overall_score']
         structure_score = report['structure_score']
         quality_score = report['quality_score']
         security_score = report['security_score']
 
-        await conn.execute(
-            """
-            UPDATE analyses SET
-                status = 'completed',
-                completed_at = $1,
-                overall_score = $2,
-                structure_score = $3,
-                quality_score = $4,
-                security_score = $5
-            WHERE id = $6
-            """,
-            datetime.now(),
+        await pool.execute(
+            UPDATE_COMPLETED_SQL,
             overall_score,
             structure_score,
             quality_score,
@@ -129,20 +102,15 @@ async def run_real_analysis(project_id: int, analysis_id: int):
         )
 
     except Exception as e:
-        if conn:
+        if pool:
             try:
-                await conn.execute(
-                    "UPDATE analyses SET status = 'failed' WHERE id = $1",
-                    analysis_id
-                )
+                await pool.execute(UPDATE_FAILED_SQL, analysis_id)
             except:
                 pass
         raise
     finally:
-        if conn:
-            await conn.close()
-        if project_path and os.path.exists(project_path):
-            shutil.rmtree(project_path)
+        if project_path:
+            await asyncio.to_thread(shutil.rmtree, project_path, ignore_errors=True)
 
 
 
@@ -2,19 +2,32 @@
 File upload API endpoints for project creation from uploaded files.
 Handles multipart file uploads, validation, and project creation.
 """
+import asyncio
+import logging
+import os
 import tempfile
 import shutil
 import mimetypes
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator, BinaryIO
 import time
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import re
+import secrets
+import string
+import zipfile
 
+import asyncpg
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
 from pydantic import BaseModel
 
 from app.auth import AuthorizedUser
-from app.apis.projects import get_db_connection, convert_user_id_to_uuid
+from app.libs.database import get_app_db_pool
+from app.apis.projects import convert_user_id_to_uuid
+
+logger = logging.getLogger(__name__)
 
 try:
     from slowapi import Limiter
@@ -25,6 +38,20 @@ except ImportError:
     limiter = None
     RATE_LIMITING_AVAILABLE = False
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None
+    XXHASH_AVAILABLE = False
+
 def rate_limit(limit_string):
     """Decorator that applies rate limiting if available, otherwise does nothing"""
     def decorator(func):
@@ -35,8 +62,17 @@ def rate_limit(limit_string):
 
 router = APIRouter(prefix="/api/projects", tags=["File Upload"])
 
+@router.on_event("shutdown")
+async def close_scan_pool():
+    """Stop the content scan workers on shutdown"""
+    global _scan_pool
+    if _scan_pool is not None:
+        _scan_pool.shutdown(cancel_futures=True)
+        _scan_pool = None
+
 MAX_FILE_SIZE = 100 * 1024 * 1024
 MAX_TOTAL_SIZE = 500 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 ALLOWED_EXTENSIONS = {
     '.py', '.pyx', '.pyi', '.pyw',
     '.txt', '.md', '.rst', '.doc',
@@ -49,12 +85,37 @@ ALLOWED_EXTENSIONS = {
     '.env', '.env.example',
 }
 
+ARCHIVE_EXTENSIONS = {'.zip'}
+
+mimetypes.init()
+_EXT_TO_MIME = {ext: mimetypes.guess_type('x' + ext)[0] for ext in ALLOWED_EXTENSIONS}
+
 PYTHON_PROJECT_INDICATORS = {
     'setup.py', 'pyproject.toml', 'requirements.txt', 
     'Pipfile', 'poetry.lock', 'conda.yml', 'environment.yml',
     'main.py', '__init__.py', 'app.py', 'manage.py'
 }
 
+PYTHON_SUFFIXES = ('.py', '.pyx', '.pyi')
+CONTENT_SCAN_SUFFIXES = {'.py', '.pyx', '.pyi', '.toml', '.txt', '.cfg'}
+CONTENT_SCAN_BYTES = 64 * 1024
+ENTRY_POINT_MARKER = 'if __name__ == "__main__"'
+CONTENT_MARKERS = ('django', 'flask', 'fastapi', ENTRY_POINT_MARKER)
+MARKER_BITS = {marker: 1 << i for i, marker in enumerate(CONTENT_MARKERS)}
+PARALLEL_SCAN_MIN_FILES = 512
+PARALLEL_SCAN_CHUNK_SIZE = 64
+_ASCII_LOWER = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+
+if AHOCORASICK_AVAILABLE:
+    _marker_automaton = ahocorasick.Automaton()
+    for _marker in CONTENT_MARKERS:
+        _marker_automaton.add_word(_marker, _marker)
+    _marker_automaton.make_automaton()
+else:
+    _marker_pattern = re.compile('|'.join(re.escape(marker) for marker in CONTENT_MARKERS))
+
+_scan_pool: Optional[ProcessPoolExecutor] = None
+
 class FileUploadResponse(BaseModel):
     """Response model for file upload"""
     project_id: int
@@ -80,25 +141,96 @@ def validate_file_extension(filename: str) -> bool:
     ext = Path(filename).suffix.lower()
     return ext in ALLOWED_EXTENSIONS or filename.lower() in PYTHON_PROJECT_INDICATORS
 
+def guess_mime_type(filename: str) -> Optional[str]:
+    """Look up the MIME type of an allowed extension, falling back to mimetypes for anything else"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in _EXT_TO_MIME:
+        return _EXT_TO_MIME[ext]
+    return mimetypes.guess_type(filename)[0]
+
 def validate_file_size(file_size: int) -> bool:
     """Check if file size is within limits"""
     return file_size <= MAX_FILE_SIZE
 
 def calculate_file_hash(file_path: Path) -> str:
     """Calculate SHA-256 hash of file for deduplication"""
-    hash_sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_sha256.update(chunk)
-    return hash_sha256.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
-def analyze_python_project(temp_dir: Path) -> ProjectValidationResult:
-    """Analyze uploaded files to determine if it's a valid Python project"""
-    files = list(temp_dir.rglob("*"))
-    python_files = [f for f in files if f.suffix.lower() in {'.py', '.pyx', '.pyi'}]
-    
-    project_files = [f.name.lower() for f in files]
-    indicators_found = PYTHON_PROJECT_INDICATORS.intersection(set(project_files))
+def find_content_markers(content: bytes) -> set:
+    """Return the CONTENT_MARKERS occurring in content, matched case-insensitively in one pass"""
+    text = content.translate(_ASCII_LOWER).decode('latin-1')
+    if AHOCORASICK_AVAILABLE:
+        return {marker for _, marker in _marker_automaton.iter(text)}
+    return set(_marker_pattern.findall(text))
+
+def scan_file_markers(path: str) -> int:
+    """Scan the head of a file and return its CONTENT_MARKERS as a MARKER_BITS bitmask"""
+    try:
+        with open(path, 'rb') as f:
+            markers = find_content_markers(f.read(CONTENT_SCAN_BYTES))
+    except Exception:
+        return 0
+    mask = 0
+    for marker in markers:
+        mask |= MARKER_BITS[marker]
+    return mask
+
+def get_scan_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool used for large content scans"""
+    global _scan_pool
+    if _scan_pool is None:
+        # forkserver workers start from a clean interpreter instead of forking
+        # the running server with its event loop, sockets and DB pools
+        _scan_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _scan_pool
+
+def walk_directory_entries(root: Path) -> Iterator[os.DirEntry]:
+    """Yield every entry below root, relying on the file type cached by scandir"""
+    pending = [str(root)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+
+def analyze_python_project(temp_dir: Path, total_size: Optional[int] = None) -> ProjectValidationResult:
+    """
+    Analyze uploaded files to determine if it's a valid Python project.
+    When the caller already knows the total size of the saved files it can
+    pass it in, and the walk skips stat-ing every file.
+    """
+    file_count = 0
+    python_file_count = 0
+    directory_count = 0
+    measure_size = total_size is None
+    if measure_size:
+        total_size = 0
+    indicators_found = set()
+    has_init = False
+    scan_candidates = []
+    for entry in walk_directory_entries(temp_dir):
+        file_count += 1
+        name = entry.name.lower()
+        # Lowercased names against the mixed-case set, as the original
+        # intersection did, so only the all-lowercase indicators can match
+        if name in PYTHON_PROJECT_INDICATORS:
+            indicators_found.add(name)
+        if entry.is_dir(follow_symlinks=False):
+            directory_count += 1
+        elif entry.is_file(follow_symlinks=False):
+            if measure_size:
+                total_size += entry.stat(follow_symlinks=False).st_size
+            if name.endswith(PYTHON_SUFFIXES):
+                python_file_count += 1
+            if os.path.splitext(name)[1] in CONTENT_SCAN_SUFFIXES:
+                scan_candidates.append(entry.path)
+        if '__init__.py' in entry.name:
+            has_init = True
     
     confidence = 0.0
     detected_frameworks = []
@@ -107,36 +239,34 @@ def analyze_python_project(temp_dir: Path) -> ProjectValidationResult:
     warnings = []
     errors = []
     
-    if python_files:
+    if python_file_count:
         confidence += 0.4
     if indicators_found:
         confidence += 0.3
-    if any('__init__.py' in str(f) for f in files):
+    if has_init:
         confidence += 0.2
         detected_frameworks.append('Python Package')
     
-    for file in files:
-        if file.is_file():
-            try:
-                content = file.read_text(encoding='utf-8', errors='ignore').lower()
-                
-                if 'django' in content or 'manage.py' in project_files:
-                    detected_frameworks.append('Django')
-                    confidence += 0.1
-                
-                if 'flask' in content:
-                    detected_frameworks.append('Flask')
-                    confidence += 0.1
-                
-                if 'fastapi' in content:
-                    detected_frameworks.append('FastAPI')
-                    confidence += 0.1
-                
-                if 'if __name__ == "__main__"' in content:
-                    entry_points.append(str(file.relative_to(temp_dir)))
-                    
-            except Exception:
-                continue
+    if len(scan_candidates) >= PARALLEL_SCAN_MIN_FILES:
+        masks = get_scan_pool().map(scan_file_markers, scan_candidates, chunksize=PARALLEL_SCAN_CHUNK_SIZE)
+    else:
+        masks = map(scan_file_markers, scan_candidates)
+    
+    for path, mask in zip(scan_candidates, masks):
+        if mask & MARKER_BITS['django'] or 'manage.py' in indicators_found:
+            detected_frameworks.append('Django')
+            confidence += 0.1
+        
+        if mask & MARKER_BITS['flask']:
+            detected_frameworks.append('Flask')
+            confidence += 0.1
+        
+        if mask & MARKER_BITS['fastapi']:
+            detected_frameworks.append('FastAPI')
+            confidence += 0.1
+        
+        if mask & MARKER_BITS[ENTRY_POINT_MARKER]:
+            entry_points.append(os.path.relpath(path, temp_dir))
     
     for indicator in ['requirements.txt', 'pyproject.toml', 'Pipfile']:
         dep_file = temp_dir / indicator
@@ -149,21 +279,20 @@ def analyze_python_project(temp_dir: Path) -> ProjectValidationResult:
             except Exception:
                 warnings.append(f"Could not read {indicator}")
     
-    if not python_files and not indicators_found:
+    if not python_file_count and not indicators_found:
         errors.append("No Python files or project indicators found")
         confidence = 0.0
     
-    if len(files) > 10000:
+    if file_count > 10000:
         warnings.append("Large number of files detected - processing may be slow")
     
-    total_size = sum(f.stat().st_size for f in files if f.is_file())
     if total_size > MAX_TOTAL_SIZE:
         errors.append(f"Project too large ({total_size / 1024 / 1024:.1f}MB > {MAX_TOTAL_SIZE / 1024 / 1024}MB)")
     
     structure_analysis = {
-        'total_files': len(files),
-        'python_files': len(python_files),
-        'directories': len([f for f in files if f.is_dir()]),
+        'total_files': file_count,
+        'python_files': python_file_count,
+        'directories': directory_count,
         'total_size_bytes': total_size,
         'indicators_found': list(indicators_found)
     }
@@ -179,8 +308,90 @@ def analyze_python_project(temp_dir: Path) -> ProjectValidationResult:
         errors=errors
     )
 
+def stream_upload_to_disk(source: BinaryIO, filename: str, file_path: Path, total_size: int) -> Tuple[int, str]:
+    """
+    Copy an upload to disk and hash it in the same pass, enforcing size limits as bytes arrive.
+    The hash only deduplicates files within one request, so the non-cryptographic
+    xxh3-128 is used when available.
+    """
+    file_hasher = xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.sha256()
+    file_size = 0
+    
+    with open(file_path, 'wb') as f:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            
+            if not validate_file_size(file_size):
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large: {filename} (> {MAX_FILE_SIZE / 1024 / 1024}MB)"
+                )
+            
+            if total_size + file_size > MAX_TOTAL_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Total upload size too large (> {MAX_TOTAL_SIZE / 1024 / 1024}MB)"
+                )
+            
+            file_hasher.update(chunk)
+            f.write(chunk)
+    
+    return file_size, file_hasher.hexdigest()
+
+def extract_uploaded_zip(source: BinaryIO, filename: str, temp_dir: Path, total_size: int,
+                         file_hashes: set) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Extract the allowed members of an uploaded ZIP through stream_upload_to_disk,
+    so size limits apply to the bytes actually written and members are hashed and
+    deduplicated exactly like regular uploads.
+    """
+    saved_files = []
+    root = temp_dir.resolve()
+    
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {filename}")
+    
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or not validate_file_extension(Path(info.filename).name):
+                continue
+            
+            file_path = (root / info.filename).resolve()
+            if not file_path.is_relative_to(root):
+                raise HTTPException(status_code=400, detail=f"Invalid path in ZIP archive: {info.filename}")
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Every member reaches disk, so the project tree is complete; the
+            # hash only keeps duplicate content out of the metadata
+            try:
+                with archive.open(info) as member:
+                    file_size, file_hash = stream_upload_to_disk(member, info.filename, file_path, total_size)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Corrupt member in ZIP archive: {info.filename}")
+            total_size += file_size
+            
+            if file_hash in file_hashes:
+                continue
+            file_hashes.add(file_hash)
+            
+            saved_files.append({
+                'filename': info.filename,
+                'size': file_size,
+                'path': str(file_path.relative_to(root)),
+                'hash': file_hash,
+                'mime_type': guess_mime_type(info.filename)
+            })
+    
+    return saved_files, total_size
+
 async def save_uploaded_files(files: List[UploadFile], temp_dir: Path) -> Dict[str, Any]:
-    """Save uploaded files to temporary directory and return metadata"""
+    """
+    Save uploaded files to temporary directory and return metadata.
+    Each UploadFile is consumed once; callers needing its content again
+    should read the saved copy under temp_dir.
+    """
     saved_files = []
     total_size = 0
     file_hashes = set()
@@ -188,6 +399,13 @@ async def save_uploaded_files(files: List[UploadFile], temp_dir: Path) -> Dict[s
     for file in files:
         if not file.filename:
             continue
+        
+        if Path(file.filename).suffix.lower() in ARCHIVE_EXTENSIONS:
+            archive_files, total_size = await asyncio.to_thread(
+                extract_uploaded_zip, file.file, file.filename, temp_dir, total_size, file_hashes
+            )
+            saved_files.extend(archive_files)
+            continue
             
         if not validate_file_extension(file.filename):
             raise HTTPException(
@@ -195,30 +413,14 @@ async def save_uploaded_files(files: List[UploadFile], temp_dir: Path) -> Dict[s
                 detail=f"File type not allowed: {file.filename}"
             )
         
-        content = await file.read()
-        file_size = len(content)
-        
-        if not validate_file_size(file_size):
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large: {file.filename} ({file_size / 1024 / 1024:.1f}MB > {MAX_FILE_SIZE / 1024 / 1024}MB)"
-            )
-        
-        total_size += file_size
-        
-        if total_size > MAX_TOTAL_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail=f"Total upload size too large ({total_size / 1024 / 1024:.1f}MB > {MAX_TOTAL_SIZE / 1024 / 1024}MB)"
-            )
-        
         file_path = temp_dir / file.filename
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        file_size, file_hash = await asyncio.to_thread(
+            stream_upload_to_disk, file.file, file.filename, file_path, total_size
+        )
+        total_size += file_size
         
-        file_hash = hashlib.sha256(content).hexdigest()
         if file_hash in file_hashes:
             continue
         file_hashes.add(file_hash)
@@ -228,10 +430,8 @@ async def save_uploaded_files(files: List[UploadFile], temp_dir: Path) -> Dict[s
             'size': file_size,
             'path': str(file_path.relative_to(temp_dir)),
             'hash': file_hash,
-            'mime_type': mimetypes.guess_type(file.filename)[0]
+            'mime_type': guess_mime_type(file.filename)
         })
-        
-        await file.seek(0)
     
     return {
         'files': saved_files,
@@ -255,18 +455,18 @@ async def upload_project_files(
     db_user_id = convert_user_id_to_uuid(user.sub)
     temp_dir = None
     
-    print(f"📤 API: POST /upload - Starting upload for user {user.sub} (DB ID: {db_user_id})")
-    print(f"📁 API: Received {len(files)} files")
+    logger.debug("API: POST /upload - Starting upload for user %s (DB ID: %s)", user.sub, db_user_id)
+    logger.debug("API: Received %s files", len(files))
     
     try:
         temp_dir = Path(tempfile.mkdtemp(prefix="archon_upload_"))
-        print(f"📂 API: Created temp directory: {temp_dir}")
+        logger.debug("API: Created temp directory: %s", temp_dir)
         
         file_metadata = await save_uploaded_files(files, temp_dir)
-        print(f"💾 API: Saved {file_metadata['file_count']} files ({file_metadata['total_size'] / 1024 / 1024:.1f}MB)")
+        logger.info("API: Saved %s files (%.1fMB)", file_metadata['file_count'], file_metadata['total_size'] / 1024 / 1024)
         
-        validation_result = analyze_python_project(temp_dir)
-        print(f"🔍 API: Project analysis - Python: {validation_result.is_python_project}, Confidence: {validation_result.confidence_score:.2f}")
+        validation_result = await asyncio.to_thread(analyze_python_project, temp_dir, file_metadata['total_size'])
+        logger.info("API: Project analysis - Python: %s, Confidence: %.2f", validation_result.is_python_project, validation_result.confidence_score)
         
         if not validation_result.is_python_project:
             raise HTTPException(
@@ -280,43 +480,50 @@ async def upload_project_files(
                 detail=f"Project validation failed: {', '.join(validation_result.errors)}"
             )
         
+        # Generated names carry 32 random bits, so only names chosen by the
+        # user need the duplicate check before inserting
+        check_existing = bool(project_name)
         if not project_name:
-            project_name = f"uploaded-project-{int(time.time())}"
+            project_name = f"uploaded-project-{secrets.token_hex(4)}"
         
-        conn = await get_db_connection()
-        try:
-            existing = await conn.fetchrow(
-                "SELECT id FROM projects WHERE user_id = $1 AND repo_name = $2",
-                db_user_id, project_name
-            )
+        pool = await get_app_db_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            if check_existing:
+                exists = await conn.fetchval(
+                    "SELECT EXISTS(SELECT 1 FROM projects WHERE user_id = $1 AND repo_name = $2)",
+                    db_user_id, project_name
+                )
+                
+                if exists:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Project '{project_name}' already exists"
+                    )
             
-            if existing:
+            try:
+                project_id = await conn.fetchval(
+                    """
+                    INSERT INTO projects (user_id, repo_name, repo_owner, repo_url, created_at)
+                    VALUES ($1, $2, $3, $4, NOW())
+                    RETURNING id
+                    """,
+                    db_user_id,
+                    project_name,
+                    user.email or "uploaded",
+                    f"upload://{project_name}"
+                )
+            except asyncpg.UniqueViolationError:
                 raise HTTPException(
                     status_code=409,
                     detail=f"Project '{project_name}' already exists"
                 )
             
-            project_id = await conn.fetchval(
-                """
-                INSERT INTO projects (user_id, repo_name, repo_owner, repo_url, created_at)
-                VALUES ($1, $2, $3, $4, NOW())
-                RETURNING id
-                """,
-                db_user_id,
-                project_name,
-                user.email or "uploaded",
-                f"upload://{project_name}"
-            )
-            
-            print(f"✅ API: Created project with ID {project_id}")
-            
-        finally:
-            await conn.close()
+            logger.info("API: Created project with ID %s", project_id)
         
         # TODO: In a real implementation, you would:
         
         total_time = (time.time() - operation_start) * 1000
-        print(f"🎉 API: Upload completed successfully in {total_time:.2f}ms")
+        logger.info("API: Upload completed successfully in %.2fms", total_time)
         
         return FileUploadResponse(
             project_id=project_id,
@@ -330,12 +537,12 @@ async def upload_project_files(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ API: Upload error: {str(e)}")
+        logger.exception("API: Upload error: %s", e)
         raise HTTPException(status_code=500, detail="Upload processing failed")
     finally:
         if temp_dir and temp_dir.exists():
             try:
                 shutil.rmtree(temp_dir)
-                print(f"🧹 API: Cleaned up temp directory: {temp_dir}")
+                logger.debug("API: Cleaned up temp directory: %s", temp_dir)
             except Exception as e:
-                print(f"⚠️ API: Failed to cleanup temp directory: {e}")
+                logger.warning("API: Failed to cleanup temp directory: %s", e)
@@ -1,16 +1,49 @@
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
-from typing import Optional
-import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
 import time
+import hmac
+import base64
+import binascii
+import hashlib
+import secrets
+from functools import lru_cache
+from urllib.parse import quote
+import httpx
+import redis.asyncio as redis
+from redis.exceptions import RedisError
 from app.auth import AuthorizedUser
-from app.libs.encryption import encrypt_token, decrypt_token
+from app.config import settings
+from app.libs.database import get_db_pool
+from app.libs.encryption import encrypt_token, decrypt_token_cached
+from app.libs.utils.json_utils import json_dumps, json_loads
 
+logger = logging.getLogger(__name__)
 
 try:
     from slowapi import Limiter
     from slowapi.util import get_remote_address
-    limiter = Limiter(key_func=get_remote_address)
+
+    def rate_limit_key(request: Request) -> str:
+        """Key authenticated requests by user so clients behind one NAT don't share a budget"""
+        user_sub = getattr(request.state, "user_sub", None)
+        return f"user:{user_sub}" if user_sub else get_remote_address(request)
+
+    # Counters live in Redis so every worker and replica enforces one shared limit.
+    # slowapi talks to Redis synchronously, so keep the socket timeouts short and
+    # fall back to per-process counters while Redis is unreachable instead of
+    # failing every /github/* request
+    limiter = Limiter(
+        key_func=rate_limit_key,
+        storage_uri=settings.redis_url,
+        storage_options={"socket_timeout": 0.2, "socket_connect_timeout": 0.2},
+        strategy="moving-window",
+        in_memory_fallback_enabled=True,
+        swallow_errors=True
+    )
     RATE_LIMITING_AVAILABLE = True
 except ImportError:
     limiter = None
@@ -27,6 +60,52 @@ def rate_limit(limit_string):
 router = APIRouter()
 public_router = APIRouter()
 
+_github_client: Optional[httpx.AsyncClient] = None
+
+def get_github_client() -> httpx.AsyncClient:
+    """Get the shared GitHub HTTP client, creating it on first use"""
+    global _github_client
+    if _github_client is None:
+        _github_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _github_client
+
+_redis_client: Optional[redis.Redis] = None
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-run
+_background_tasks: Set[asyncio.Task] = set()
+
+def get_redis_client() -> redis.Redis:
+    """Get the shared Redis client, creating it on first use"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.redis_url, max_connections=50)
+    return _redis_client
+
+@router.on_event("startup")
+async def open_github_client():
+    """Create the GitHub HTTP client before the first request"""
+    get_github_client()
+
+@router.on_event("shutdown")
+async def close_github_client():
+    """Close pooled GitHub connections on shutdown"""
+    global _github_client
+    if _github_client is not None:
+        await _github_client.aclose()
+        _github_client = None
+
+@router.on_event("shutdown")
+async def close_redis_client():
+    """Close pooled Redis connections on shutdown"""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
 class GitHubConnectionStatus(BaseModel):
     connected: bool
     username: Optional[str] = None
@@ -35,7 +114,19 @@ class GitHubConnectionStatus(BaseModel):
 class GitHubAuthUrlResponse(BaseModel):
     auth_url: str
 
-DEVELOPMENT_MODE = os.getenv("APP_ENV", "development") != "production"
+GITHUB_API_VERSION = "2022-11-28"
+GITHUB_REPOS_URL = "https://api.github.com/user/repos"
+GITHUB_REPOS_PARAMS = {"sort": "updated", "per_page": 100, "type": "all"}
+GITHUB_MAX_REPO_PAGES = 10
+GITHUB_PAGE_CONCURRENCY = 5
+GITHUB_REPOS_CACHE_TTL_SECONDS = 300
+GITHUB_STATUS_CACHE_TTL_SECONDS = 60
+
+# One statement text for every user lookup, so each pooled connection
+# prepares and plans it once and serves both endpoints from its cache
+SELECT_USER_SQL = "SELECT github_access_token, username, avatar_url FROM users WHERE id = $1"
+
+DEVELOPMENT_MODE = not settings.is_production
 
 MOCK_GITHUB_USER = {
     "connected": False,
@@ -45,6 +136,221 @@ MOCK_GITHUB_USER = {
 
 user_github_connections = {}
 
+MOCK_REPOSITORIES = (
+    {
+        "id": 1,
+        "name": "python-data-analyzer",
+        "description": "A comprehensive Python data analysis toolkit with pandas and numpy",
+        "language": "Python",
+        "stargazers_count": 42,
+        "forks_count": 12,
+        "updated_at": "2024-01-15T10:30:00Z",
+        "private": False
+    },
+    {
+        "id": 2,
+        "name": "ml-pipeline",
+        "description": "Machine learning pipeline with scikit-learn and TensorFlow",
+        "language": "Python",
+        "stargazers_count": 28,
+        "forks_count": 8,
+        "updated_at": "2024-01-12T14:20:00Z",
+        "private": False
+    },
+    {
+        "id": 3,
+        "name": "web-scraper",
+        "description": "Python web scraping tool using BeautifulSoup and Scrapy",
+        "language": "Python",
+        "stargazers_count": 15,
+        "forks_count": 5,
+        "updated_at": "2024-01-08T09:15:00Z",
+        "private": True
+    },
+)
+
+@lru_cache(maxsize=1024)
+def mock_repositories_body(owner: str, count: int = len(MOCK_REPOSITORIES)) -> bytes:
+    """Serialized demo repository listing for the given owner, built once per owner"""
+    return json_dumps({
+        "repositories": [
+            {
+                **repo,
+                "full_name": f"{owner}/{repo['name']}",
+                "owner": {"login": owner},
+                "html_url": f"https://github.com/{owner}/{repo['name']}"
+            }
+            for repo in MOCK_REPOSITORIES[:count]
+        ]
+    })
+
+def mock_repositories_response(owner: str, count: int = len(MOCK_REPOSITORIES)) -> Response:
+    return Response(content=mock_repositories_body(owner, count), media_type="application/json")
+
+OAUTH_STATE_TTL_SECONDS = 600
+OAUTH_STATE_NONCE_BYTES = 16
+OAUTH_STATE_MAC_BYTES = 16
+OAUTH_STATE_KEY = hashlib.sha256(b"archon:github-oauth-state:" + settings.jwt_secret_key.encode()).digest()
+
+def sign_oauth_state(user_sub: str, nonce: bytes, issued_at: bytes) -> bytes:
+    """MAC binding an OAuth state nonce and issue time to a user"""
+    message = user_sub.encode() + b"|" + nonce + issued_at
+    return hmac.new(OAUTH_STATE_KEY, message, hashlib.sha256).digest()[:OAUTH_STATE_MAC_BYTES]
+
+def create_oauth_state(user_sub: str) -> str:
+    """Create a signed OAuth state for the user, so nothing has to be stored until the callback"""
+    nonce = secrets.token_bytes(OAUTH_STATE_NONCE_BYTES)
+    issued_at = int(time.time()).to_bytes(8, "big")
+    raw = nonce + issued_at + sign_oauth_state(user_sub, nonce, issued_at)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def verify_oauth_state(user_sub: str, state: str) -> Optional[bytes]:
+    """Return the state's nonce if it was issued to this user and has not expired, otherwise None"""
+    try:
+        raw = base64.urlsafe_b64decode(state + "=" * (-len(state) % 4))
+    except (ValueError, binascii.Error):
+        return None
+    if len(raw) != OAUTH_STATE_NONCE_BYTES + 8 + OAUTH_STATE_MAC_BYTES:
+        return None
+    nonce = raw[:OAUTH_STATE_NONCE_BYTES]
+    issued_at = raw[OAUTH_STATE_NONCE_BYTES:OAUTH_STATE_NONCE_BYTES + 8]
+    mac = raw[OAUTH_STATE_NONCE_BYTES + 8:]
+    if not hmac.compare_digest(mac, sign_oauth_state(user_sub, nonce, issued_at)):
+        return None
+    if not 0 <= time.time() - int.from_bytes(issued_at, "big") <= OAUTH_STATE_TTL_SECONDS:
+        return None
+    return nonce
+
+@lru_cache(maxsize=1)
+def github_oauth_url_prefix() -> Optional[str]:
+    """Build the GitHub authorize URL up to the state value, or None if OAuth is not configured"""
+    if not settings.github_client_id or not settings.github_redirect_uri:
+        return None
+    return (
+        f"https://github.com/login/oauth/authorize"
+        f"?client_id={quote(settings.github_client_id, safe='')}"
+        f"&redirect_uri={quote(settings.github_redirect_uri, safe='')}"
+        f"&scope=public_repo,user:email"
+        f"&allow_signup=true"
+        f"&state="
+    )
+
+def last_page_number(response: httpx.Response) -> int:
+    """Read the last page number from GitHub's Link header, capped at GITHUB_MAX_REPO_PAGES"""
+    last = response.links.get("last")
+    if not last:
+        return 1
+    page = httpx.URL(last["url"]).params.get("page", "1")
+    return min(int(page), GITHUB_MAX_REPO_PAGES) if page.isdigit() else 1
+
+async def fetch_repo_pages(headers: Dict[str, str], last_page: int) -> List[List[Dict[str, Any]]]:
+    """Fetch repository pages 2..last_page concurrently, in page order"""
+    semaphore = asyncio.Semaphore(GITHUB_PAGE_CONCURRENCY)
+
+    async def fetch_page(page: int) -> List[Dict[str, Any]]:
+        async with semaphore:
+            response = await get_github_client().get(
+                GITHUB_REPOS_URL,
+                headers=headers,
+                params={**GITHUB_REPOS_PARAMS, "page": page}
+            )
+        response.raise_for_status()
+        return json_loads(response.content)
+
+    return await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1)))
+
+def github_api_headers(access_token: str) -> Dict[str, str]:
+    """Headers for GitHub REST API calls made on behalf of a user"""
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "Archon-Code-Analyzer/1.0",
+        "X-GitHub-Api-Version": GITHUB_API_VERSION
+    }
+
+async def fetch_repositories(headers: Dict[str, str], first_response: httpx.Response) -> List[Dict[str, Any]]:
+    """Fetch the remaining repository pages and project every repository to the fields the frontend uses"""
+    pages = [json_loads(first_response.content)]
+    pages.extend(await fetch_repo_pages(headers, last_page_number(first_response)))
+    return [
+        {
+            "id": repo["id"],
+            "name": repo["name"],
+            "full_name": repo["full_name"],
+            "description": repo.get("description"),
+            "private": repo["private"],
+            "html_url": repo["html_url"],
+            "language": repo.get("language"),
+            "stargazers_count": repo["stargazers_count"],
+            "forks_count": repo.get("forks_count", 0),
+            "updated_at": repo["updated_at"],
+            "owner": {"login": repo["owner"]["login"]}
+        }
+        for page in pages
+        for repo in page
+    ]
+
+async def prime_repos_cache(user_sub: str, access_token: str) -> None:
+    """Fetch and cache the user's repository listing so the first /github/repositories call is a 304"""
+    headers = github_api_headers(access_token)
+    try:
+        response = await get_github_client().get(GITHUB_REPOS_URL, headers=headers, params=GITHUB_REPOS_PARAMS)
+        etag = response.headers.get("ETag")
+        if not response.is_success or not etag:
+            return
+        repositories = await fetch_repositories(headers, response)
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        logger.warning("GitHub: Could not prefetch repositories for user %s: %s", user_sub, e)
+        return
+    await store_cached_repos(user_sub, etag, json_dumps({"repositories": repositories}))
+
+async def get_cached_repos(user_sub: str) -> Tuple[Optional[str], Optional[bytes]]:
+    """Return the ETag and response body of the user's last repository listing, if cached"""
+    try:
+        etag, body = await get_redis_client().hmget(f"gh:repos:{user_sub}", "etag", "body")
+    except RedisError as e:
+        logger.warning("GitHub: Repository cache unavailable: %s", e)
+        return None, None
+    if not etag or not body:
+        return None, None
+    return etag.decode(), body
+
+async def store_cached_repos(user_sub: str, etag: str, body: bytes) -> None:
+    """Remember a repository listing together with the ETag of its first page"""
+    cache_key = f"gh:repos:{user_sub}"
+    try:
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.hset(cache_key, mapping={"etag": etag, "body": body})
+            pipe.expire(cache_key, GITHUB_REPOS_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("GitHub: Repository cache unavailable: %s", e)
+
+async def get_cached_status(user_sub: str) -> Optional[GitHubConnectionStatus]:
+    """Return the user's recently computed connection status, if cached"""
+    try:
+        cached = await get_redis_client().get(f"gh:status:{user_sub}")
+    except RedisError as e:
+        logger.warning("GitHub: Status cache unavailable: %s", e)
+        return None
+    return GitHubConnectionStatus.model_validate_json(cached) if cached else None
+
+async def store_cached_status(user_sub: str, status: GitHubConnectionStatus) -> None:
+    """Remember the user's connection status for GITHUB_STATUS_CACHE_TTL_SECONDS"""
+    try:
+        await get_redis_client().set(
+            f"gh:status:{user_sub}", status.model_dump_json(), ex=GITHUB_STATUS_CACHE_TTL_SECONDS
+        )
+    except RedisError as e:
+        logger.warning("GitHub: Status cache unavailable: %s", e)
+
+async def drop_cached_status(user_sub: str) -> None:
+    """Forget the user's cached connection status"""
+    try:
+        await get_redis_client().delete(f"gh:status:{user_sub}")
+    except RedisError as e:
+        logger.warning("GitHub: Status cache unavailable: %s", e)
+
 @router.get("/github/status")
 @rate_limit("10/minute")
 async def get_github_connection_status(request: Request, user: AuthorizedUser) -> GitHubConnectionStatus:
@@ -52,46 +358,41 @@ async def get_github_connection_status(request: Request, user: AuthorizedUser) -
     Check if the user has connected their GitHub account via custom OAuth
     """
     try:
-        from app.libs.database import get_db_connection
-
-        def convert_user_id_to_uuid(user_id: str) -> str:
-            return user_id
-
-        db_user_id = convert_user_id_to_uuid(user.sub)
-        print(f"🔗 GitHub: Checking connection status for user {user.sub} (DB ID: {db_user_id})")
-
-        conn = await get_db_connection()
-        try:
-            user_record = await conn.fetchrow(
-                "SELECT github_access_token, username, avatar_url FROM users WHERE id = $1",
-                db_user_id
-            )
-            if not user_record:
-                print(f"🔍 GitHub: User ID {db_user_id} not found, checking for GitHub account to migrate...")
-                pass
-
-            if user_record and user_record['github_access_token'] and user_record['github_access_token'] != 'mock-token':
-                decrypted_token = decrypt_token(user_record['github_access_token'])
-                if decrypted_token and decrypted_token != 'mock-token':
-                    print(f"✅ GitHub: User {user.sub} has valid access token")
-                    return GitHubConnectionStatus(
-                        connected=True,
-                        username=user_record['username'],
-                        avatar_url=user_record['avatar_url']
-                    )
-            else:
-                print(f"❌ GitHub: User {user.sub} has no valid access token")
-                return GitHubConnectionStatus(
-                    connected=False,
-                    username=None,
-                    avatar_url=None
+        # The UI polls this endpoint, so answer from Redis while the cached
+        # status is fresh and skip Postgres and token decryption entirely
+        cached_status = await get_cached_status(user.sub)
+        if cached_status is not None:
+            return cached_status
+
+        logger.debug("GitHub: Checking connection status for user %s", user.sub)
+
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            user_record = await conn.fetchrow(SELECT_USER_SQL, user.sub)
+        if not user_record:
+            logger.debug("GitHub: User ID %s not found, checking for GitHub account to migrate", user.sub)
+
+        status = GitHubConnectionStatus(connected=False, username=None, avatar_url=None)
+        if user_record and user_record['github_access_token'] and user_record['github_access_token'] != 'mock-token':
+            decrypted_token = decrypt_token_cached(user_record['github_access_token'])
+            if decrypted_token and decrypted_token != 'mock-token':
+                logger.debug("GitHub: User %s has valid access token", user.sub)
+                status = GitHubConnectionStatus(
+                    connected=True,
+                    username=user_record['username'],
+                    avatar_url=user_record['avatar_url']
                 )
-        finally:
-            await conn.close()
+        if not status.connected:
+            logger.debug("GitHub: User %s has no valid access token", user.sub)
 
-    except Exception as e:
-        print(f"❌ GitHub: Status check error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        await store_cached_status(user.sub, status)
+        return status
+
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("GitHub: Status check error")
+        raise HTTPException(status_code=500, detail="GitHub status check failed")
 
 @router.get("/github/connect")
 @rate_limit("5/minute")
@@ -100,62 +401,39 @@ async def connect_github(request: Request, user: AuthorizedUser) -> GitHubAuthUr
     Initiate GitHub OAuth flow to connect user's GitHub account.
     """
     try:
-        import os
-
-        github_client_id = os.getenv("GITHUB_CLIENT_ID")
-        github_redirect_uri = os.getenv("GITHUB_REDIRECT_URI")
+        oauth_url_prefix = github_oauth_url_prefix()
 
-        if not github_client_id or not github_redirect_uri:
+        if not oauth_url_prefix:
             raise HTTPException(
                 status_code=500,
                 detail="GitHub OAuth not configured. Please contact administrator."
             )
 
-        import secrets
-        import redis
-        import json
-        
-        state = secrets.token_urlsafe(32)
-        
-        redis_client = redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
-        state_data = {
-            "user_sub": user.sub,
-            "timestamp": int(time.time())
-        }
-        redis_client.setex(f"github_oauth_state:{state}", 600, json.dumps(state_data))
-        print(f"✅ GitHub: Generated and stored state {state} for user {user.sub}")
-
-        github_oauth_url = (
-            f"https://github.com/login/oauth/authorize"
-            f"?client_id={github_client_id}"
-            f"&redirect_uri={github_redirect_uri}"
-            f"&scope=public_repo,user:email"
-            f"&state={state}"
-            f"&allow_signup=true"
-        )
+        state = create_oauth_state(user.sub)
+        logger.debug("GitHub: Generated state %s for user %s", state, user.sub)
 
-        print(f"🔗 GitHub: Generated OAuth URL for user {user.sub}")
+        github_oauth_url = oauth_url_prefix + state
+
+        logger.debug("GitHub: Generated OAuth URL for user %s", user.sub)
 
         return GitHubAuthUrlResponse(
             auth_url=github_oauth_url,
             state=state
         )
 
-    except Exception as e:
-        print(f"❌ GitHub Connect Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("GitHub: Connect error")
+        raise HTTPException(status_code=500, detail="GitHub connect failed")
 
-@router.post("/github/callback")
+@router.post("/github/callback", response_class=ORJSONResponse)
 @rate_limit("10/minute")
 async def github_oauth_callback(request: Request, user: AuthorizedUser):
     """
     Handle GitHub OAuth callback and store access token.
     """
     try:
-        import os
-        import httpx
-        from app.libs.database import get_db_connection
-
         data = await request.json()
         code = data.get("code")
         state = data.get("state")
@@ -166,121 +444,115 @@ async def github_oauth_callback(request: Request, user: AuthorizedUser):
         if not state:
             raise HTTPException(status_code=400, detail="Missing state parameter")
         
-        import redis
-        import json
-        redis_client = redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
-        
-        stored_state_data = redis_client.get(f"github_oauth_state:{state}")
-        if not stored_state_data:
-            print(f"❌ GitHub: State {state} not found in Redis for user {user.sub}")
+        nonce = verify_oauth_state(user.sub, state)
+        if nonce is None:
+            logger.warning("GitHub: State %s is invalid or expired for user %s", state, user.sub)
             raise HTTPException(status_code=400, detail="Invalid or expired state parameter")
-        
-        try:
-            state_data = json.loads(stored_state_data)
-        except json.JSONDecodeError as e:
-            print(f"❌ GitHub: Failed to decode state data: {e}")
-            raise HTTPException(status_code=400, detail="Invalid state format")
-            
-        if state_data["user_sub"] != user.sub:
-            print(f"❌ GitHub: State user mismatch. Expected: {user.sub}, Got: {state_data['user_sub']}")
-            raise HTTPException(status_code=400, detail="State parameter mismatch")
-        
-        redis_client.delete(f"github_oauth_state:{state}")
-        print(f"✅ GitHub: State {state} verified and deleted for user {user.sub}")
 
-        github_client_id = os.getenv("GITHUB_CLIENT_ID")
-        github_client_secret = os.getenv("GITHUB_CLIENT_SECRET")
+        # The signature proves who the state was issued to; the NX marker makes
+        # sure it is redeemed at most once within its lifetime
+        first_use = await get_redis_client().set(
+            f"github_oauth_state:{nonce.hex()}", 1, ex=OAUTH_STATE_TTL_SECONDS, nx=True
+        )
+        if not first_use:
+            logger.warning("GitHub: State %s was already used for user %s", state, user.sub)
+            raise HTTPException(status_code=400, detail="Invalid or expired state parameter")
 
-        if not github_client_id or not github_client_secret:
+        logger.debug("GitHub: State %s verified for user %s", state, user.sub)
+
+        if not settings.github_client_id or not settings.github_client_secret:
             raise HTTPException(
                 status_code=500,
                 detail="GitHub OAuth not configured"
             )
 
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                "https://github.com/login/oauth/access_token",
-                headers={"Accept": "application/json"},
-                data={
-                    "client_id": github_client_id,
-                    "client_secret": github_client_secret,
-                    "code": code
-                }
+        token_response = await get_github_client().post(
+            "https://github.com/login/oauth/access_token",
+            headers={"Accept": "application/json"},
+            data={
+                "client_id": settings.github_client_id,
+                "client_secret": settings.github_client_secret,
+                "code": code
+            }
+        )
+
+        if not token_response.is_success:
+            logger.warning("GitHub: Token exchange failed: %s", token_response.status_code)
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to exchange authorization code for access token"
             )
 
-            if not token_response.is_success:
-                print(f"❌ GitHub: Token exchange failed: {token_response.status_code}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to exchange authorization code for access token"
-                )
+        token_data = json_loads(token_response.content)
+        access_token = token_data.get("access_token")
 
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
+        if not access_token:
+            logger.warning("GitHub: No access token in response: %s", token_data)
+            raise HTTPException(
+                status_code=400,
+                detail="No access token received from GitHub"
+            )
 
-            if not access_token:
-                print(f"❌ GitHub: No access token in response: {token_data}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="No access token received from GitHub"
-                )
+        user_response = await get_github_client().get(
+            "https://api.github.com/user",
+            headers=github_api_headers(access_token)
+        )
 
-            user_response = await client.get(
-                "https://api.github.com/user",
-                headers={"Authorization": f"Bearer {access_token}"}
+        if not user_response.is_success:
+            logger.warning("GitHub: User info request failed: %s", user_response.status_code)
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid access token"
             )
 
-            if not user_response.is_success:
-                print(f"❌ GitHub: User info request failed: {user_response.status_code}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid access token"
-                )
+        github_user = json_loads(user_response.content)
+        github_id = github_user["id"]
+        github_username = github_user["login"]
+
+        logger.info("GitHub: Successfully authenticated %s (ID: %s)", github_username, github_id)
+
+        encrypted_token = encrypt_token(access_token)
+
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO users (id, github_id, username, avatar_url, github_access_token)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (github_id) DO UPDATE SET
+                    username = EXCLUDED.username,
+                    avatar_url = EXCLUDED.avatar_url,
+                    github_access_token = EXCLUDED.github_access_token,
+                    updated_at = NOW()
+                """,
+                user.sub, github_id, github_username, github_user.get("avatar_url"), encrypted_token
+            )
 
-            github_user = user_response.json()
-            github_id = github_user["id"]
-            github_username = github_user["login"]
-
-            print(f"✅ GitHub: Successfully authenticated {github_username} (ID: {github_id})")
-
-            def convert_user_id_to_uuid(user_id: str) -> str:
-                return user_id
-
-            db_user_id = convert_user_id_to_uuid(user.sub)
-
-            conn = await get_db_connection()
-            try:
-                encrypted_token = encrypt_token(access_token)
-                
-                await conn.execute(
-                    """
-                    INSERT INTO users (id, github_id, username, avatar_url, github_access_token)
-                    VALUES ($1, $2, $3, $4, $5)
-                    ON CONFLICT (github_id) DO UPDATE SET
-                        username = EXCLUDED.username,
-                        avatar_url = EXCLUDED.avatar_url,
-                        github_access_token = EXCLUDED.github_access_token,
-                        updated_at = NOW()
-                    """,
-                    db_user_id, github_id, github_username, github_user.get("avatar_url"), encrypted_token
-                )
+        logger.info("GitHub: Stored access token for user %s -> %s", user.sub, github_username)
 
-                print(f"✅ GitHub: Stored access token for user {user.sub} -> {github_username}")
+        # The frontend lists repositories right after connecting, so warm the
+        # listing cache in the background once the token is known to be valid
+        prefetch = asyncio.create_task(prime_repos_cache(user.sub, access_token))
+        _background_tasks.add(prefetch)
+        prefetch.add_done_callback(_background_tasks.discard)
 
-                return {
-                    "success": True,
-                    "message": f"Successfully connected GitHub account: {github_username}",
-                    "github_username": github_username
-                }
+        await store_cached_status(user.sub, GitHubConnectionStatus(
+            connected=True,
+            username=github_username,
+            avatar_url=github_user.get("avatar_url")
+        ))
 
-            finally:
-                await conn.close()
+        return {
+            "success": True,
+            "message": f"Successfully connected GitHub account: {github_username}",
+            "github_username": github_username
+        }
 
-    except Exception as e:
-        print(f"❌ GitHub Callback Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"GitHub callback failed: {str(e)}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("GitHub: Callback error")
+        raise HTTPException(status_code=500, detail="GitHub callback failed")
 
 @router.delete("/github/disconnect")
 @rate_limit("5/minute")
@@ -289,6 +561,7 @@ async def disconnect_github(request: Request, user: AuthorizedUser):
     GitHub disconnection is handled by Stack Auth.
     This endpoint just returns a message.
     """
+    await drop_cached_status(user.sub)
     try:
         raise HTTPException(
             status_code=400,
@@ -298,174 +571,70 @@ async def disconnect_github(request: Request, user: AuthorizedUser):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/github/repositories")
+@router.get("/github/repositories", response_class=ORJSONResponse)
 @rate_limit("20/minute")
 async def get_github_repositories(request: Request, user: AuthorizedUser):
     """
     Get user's GitHub repositories using real GitHub OAuth
     """
     try:
-        import asyncpg
-        import httpx
-        from app.libs.database import get_db_connection
+        logger.debug("GitHub: Getting repositories for user %s", user.sub)
 
-        def convert_user_id_to_uuid(user_id: str) -> str:
-            return user_id
+        # Release the connection before talking to GitHub, so slow API calls
+        # never pin a pooled connection
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            user_record = await conn.fetchrow(SELECT_USER_SQL, user.sub)
 
-        db_user_id = convert_user_id_to_uuid(user.sub)
-        print(f"🔗 GitHub: Getting repositories for user {user.sub} (DB ID: {db_user_id})")
+        if not user_record or not user_record['github_access_token'] or user_record['github_access_token'] == 'mock-token':
+            logger.info("GitHub: No valid access token found for user %s", user.sub)
+            logger.info("GitHub: Using mock repositories for user: %s", user.name or user.email or user.sub[:8])
 
-        conn = await get_db_connection()
-        try:
-            user_record = await conn.fetchrow(
-                "SELECT github_access_token FROM users WHERE id = $1",
-                db_user_id
-            )
+            return mock_repositories_response(user.sub[:8])
 
-            if not user_record or not user_record['github_access_token'] or user_record['github_access_token'] == 'mock-token':
-                print(f"⚠️ GitHub: No valid access token found for user {user.sub}")
-                print(f"📝 Using mock repositories for user: {user.name or user.email or user.sub[:8]}")
-
-                return {
-            "repositories": [
-                {
-                    "id": 1,
-                    "name": "python-data-analyzer",
-                    "full_name": f"{user.sub[:8]}/python-data-analyzer",
-                    "owner": {"login": user.sub[:8]},
-                    "html_url": f"https://github.com/{user.sub[:8]}/python-data-analyzer",
-                    "description": "A comprehensive Python data analysis toolkit with pandas and numpy",
-                    "language": "Python",
-                    "stargazers_count": 42,
-                    "forks_count": 12,
-                    "updated_at": "2024-01-15T10:30:00Z",
-                    "private": False
-                },
-                {
-                    "id": 2,
-                    "name": "ml-pipeline",
-                    "full_name": f"{user.sub[:8]}/ml-pipeline",
-                    "owner": {"login": user.sub[:8]},
-                    "html_url": f"https://github.com/{user.sub[:8]}/ml-pipeline",
-                    "description": "Machine learning pipeline with scikit-learn and TensorFlow",
-                    "language": "Python",
-                    "stargazers_count": 28,
-                    "forks_count": 8,
-                    "updated_at": "2024-01-12T14:20:00Z",
-                    "private": False
-                },
-                {
-                    "id": 3,
-                    "name": "web-scraper",
-                    "full_name": f"{user.sub[:8]}/web-scraper",
-                    "owner": {"login": user.sub[:8]},
-                    "html_url": f"https://github.com/{user.sub[:8]}/web-scraper",
-                    "description": "Python web scraping tool using BeautifulSoup and Scrapy",
-                    "language": "Python",
-                    "stargazers_count": 15,
-                    "forks_count": 5,
-                    "updated_at": "2024-01-08T09:15:00Z",
-                    "private": True
-                }
-            ]
-        }
+        github_token = decrypt_token_cached(user_record['github_access_token'])
+        logger.debug("GitHub: Fetching real repositories for user %s", user.sub)
 
-            github_token = decrypt_token(user_record['github_access_token'])
-            print(f"🔑 GitHub: Using decrypted access token to fetch real repositories for user {user.sub}")
-
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "Authorization": f"Bearer {github_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Archon-Code-Analyzer/1.0"
-                }
-
-                github_response = await client.get(
-                    "https://api.github.com/user/repos",
-                    headers=headers,
-                    params={
-                        "sort": "updated",
-                        "per_page": 100,
-                        "type": "all"
-                    }
-                )
+        headers = github_api_headers(github_token)
 
-                if github_response.status_code == 401:
-                    print("❌ GitHub: Invalid access token")
-                    print(f"📝 Using mock repositories for user: {user.name or user.email or user.sub[:8]}")
-                    return {
-                        "repositories": [
-                            {
-                                "id": 1,
-                                "name": "python-data-analyzer",
-                                "full_name": f"{user.sub[:8]}/python-data-analyzer",
-                                "owner": {"login": user.sub[:8]},
-                                "html_url": f"https://github.com/{user.sub[:8]}/python-data-analyzer",
-                                "description": "A comprehensive Python data analysis toolkit",
-                                "language": "Python",
-                                "stargazers_count": 42,
-                                "forks_count": 12,
-                                "updated_at": "2024-01-15T10:30:00Z",
-                                "private": False
-                            }
-                        ]
-                    }
-                elif github_response.status_code == 403:
-                    print("❌ GitHub: Rate limit exceeded")
-                    raise HTTPException(
-                        status_code=429,
-                        detail="GitHub API rate limit exceeded. Please try again later."
-                    )
-                elif not github_response.is_success:
-                    print(f"❌ GitHub: API error {github_response.status_code}")
-                    raise HTTPException(
-                        status_code=502,
-                        detail=f"GitHub API error: {github_response.status_code}"
-                    )
-
-                repos_data = github_response.json()
-                print(f"✅ GitHub: Fetched {len(repos_data)} real repositories for user {user.sub}")
-
-                repositories = []
-                for repo in repos_data:
-                    repositories.append({
-                        "id": repo["id"],
-                        "name": repo["name"],
-                        "full_name": repo["full_name"],
-                        "description": repo.get("description"),
-                        "private": repo["private"],
-                        "html_url": repo["html_url"],
-                        "language": repo.get("language"),
-                        "stargazers_count": repo["stargazers_count"],
-                        "forks_count": repo.get("forks_count", 0),
-                        "updated_at": repo["updated_at"],
-                        "owner": {"login": repo["owner"]["login"]}
-                    })
-
-                return {"repositories": repositories}
-
-        finally:
-            await conn.close()
+        # A 304 for a conditional request is free against the rate limit,
+        # and the cached listing is served as-is
+        cached_etag, cached_body = await get_cached_repos(user.sub)
+        github_response = await get_github_client().get(
+            GITHUB_REPOS_URL,
+            headers={**headers, "If-None-Match": cached_etag} if cached_etag else headers,
+            params=GITHUB_REPOS_PARAMS
+        )
 
-    except Exception as e:
-        print(f"❌ GitHub: Error getting repositories: {str(e)}")
-        return {
-            "repositories": [
-                {
-                    "id": 1,
-                    "name": "python-data-analyzer",
-                    "full_name": "user/python-data-analyzer",
-                    "owner": {"login": "user"},
-                    "html_url": "https://github.com/user/python-data-analyzer",
-                    "description": "A comprehensive Python data analysis toolkit",
-                    "language": "Python",
-                    "stargazers_count": 42,
-                    "forks_count": 12,
-                    "updated_at": "2024-01-15T10:30:00Z",
-                    "private": False
-                }
-            ]
-        }
+        if github_response.status_code == 304 and cached_body:
+            return Response(content=cached_body, media_type="application/json")
+
+        if github_response.status_code == 401:
+            logger.warning("GitHub: Invalid access token")
+            logger.info("GitHub: Using mock repositories for user: %s", user.name or user.email or user.sub[:8])
+            return mock_repositories_response(user.sub[:8], 1)
+        elif github_response.status_code == 403:
+            logger.warning("GitHub: Rate limit exceeded")
+            raise HTTPException(
+                status_code=429,
+                detail="GitHub API rate limit exceeded. Please try again later."
+            )
+        elif not github_response.is_success:
+            logger.error("GitHub: API error %s", github_response.status_code)
+            raise HTTPException(
+                status_code=502,
+                detail=f"GitHub API error: {github_response.status_code}"
+            )
 
+        repositories = await fetch_repositories(headers, github_response)
+        logger.info("GitHub: Fetched %s real repositories for user %s", len(repositories), user.sub)
 
+        body = json_dumps({"repositories": repositories})
+        etag = github_response.headers.get("ETag")
+        if etag:
+            await store_cached_repos(user.sub, etag, body)
+        return Response(content=body, media_type="application/json")
 
+    except Exception as e:
+        logger.error("GitHub: Error getting repositories: %s", e)
+        return mock_repositories_response("user", 1)
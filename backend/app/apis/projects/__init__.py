@@ -1,20 +1,30 @@
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 import asyncpg
 from app.auth import AuthorizedUser
+from app.apis.github_auth import get_github_client, github_api_headers
 from app.libs.encryption import decrypt_token
-import os
+import re
+import base64
 import tempfile
 import shutil
+from collections import OrderedDict
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
-from app.libs.analysis_engine import run_analysis
-import json
-import subprocess
+from app.libs.analysis_cache import get_cached_report, store_cached_report
+from app.libs.analysis_engine import run_analysis_async
+from app.libs.database import get_app_db_pool
+from app.libs.utils.file_utils import has_any_code_file
+from app.libs.utils.git_utils import clone_repository_async, get_head_sha
+from app.libs.utils.json_utils import json_dumps, json_loads
 import asyncio
 import time
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
@@ -37,55 +47,23 @@ def rate_limit(limit_string):
 
 async def run_project_analysis(project_id: int, analysis_id: int, repo_url: str):
     """Run real analysis for a project"""
-    conn = None
+    pool = await get_app_db_pool()
     project_path = None
     try:
-        conn = await get_db_connection()
-        await conn.execute(
+        await pool.execute(
             "UPDATE analyses SET status = 'running' WHERE id = $1",
             analysis_id
         )
 
         project_path = tempfile.mkdtemp()
 
-        try:
-            subprocess.run(
-                ["git", "clone", repo_url, project_path],
-                check=True,
-                capture_output=True,
-                timeout=300
-            )
-        except subprocess.TimeoutExpired:
-            raise Exception("Repository cloning timed out")
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Failed to clone repository: {e}")
+        await clone_repository_async(repo_url, project_path)
 
         try:
-            import os
-            all_files = []
-            for root, dirs, files in os.walk(project_path):
-                if '.git' in dirs:
-                    dirs.remove('.git')
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, project_path)
-                    all_files.append(rel_path.lower())
-
-            docs_extensions = {'.md', '.txt', '.rst', '.pdf', '.doc', '.docx'}
-            config_files = {'license', 'changelog', 'authors', 'contributors', 'copying', 'install', 'news', 'readme'}
-
-            code_files = []
-            for file_path in all_files:
-                file_name = os.path.basename(file_path).lower()
-                file_ext = os.path.splitext(file_name)[1]
-                file_base = os.path.splitext(file_name)[0]
-
-                if file_ext in docs_extensions or file_base in config_files or '.git' in file_path:
-                    continue
-                code_files.append(file_path)
-
-            if len(code_files) == 0:
-                print(f"📄 Repository is empty or contains only documentation - assigning perfect scores")
+            has_code = await asyncio.to_thread(has_any_code_file, project_path)
+
+            if not has_code:
+                logger.info("Repository is empty or contains only documentation - assigning perfect scores")
                 report = {
                     "overall_score": 100.0,
                     "structure_score": 100.0,
@@ -94,12 +72,18 @@ async def run_project_analysis(project_id: int, analysis_id: int, repo_url: str)
                     "issues": []
                 }
             else:
-                print(f"🔍 Repository contains {len(code_files)} code files - running analysis")
-                report = run_analysis(project_path)
-                print(f"✅ Analysis completed for project {project_id}: Overall score {report.get('overall_score', 'N/A')}")
+                commit_sha = await asyncio.to_thread(get_head_sha, project_path)
+                report = await get_cached_report(commit_sha)
+                if report is None:
+                    logger.info("Repository contains code files - running analysis")
+                    report = await run_analysis_async(project_path)
+                    await store_cached_report(commit_sha, report)
+                else:
+                    logger.info("Reusing cached analysis of commit %s", commit_sha)
+                logger.info("Analysis completed for project %s: Overall score %s", project_id, report.get('overall_score', 'N/A'))
 
         except Exception as analysis_error:
-            print(f"❌ Analysis failed for project {project_id}: {analysis_error}")
+            logger.error("Analysis failed for project %s: %s", project_id, analysis_error)
             report = {
                 "overall_score": 100.0,
                 "structure_score": 100.0,
@@ -107,56 +91,51 @@ async def run_project_analysis(project_id: int, analysis_id: int, repo_url: str)
                 "security_score": 100.0,
                 "issues": []
             }
-            print(f"✅ Created fallback perfect score report for project {project_id}")
+            logger.info("Created fallback perfect score report for project %s", project_id)
 
         report_file_path = f"analysis_reports/analysis_report_{project_id}.json"
-        with open(report_file_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(Path(report_file_path).write_bytes, json_dumps(report))
 
         overall_score = report['overall_score']
         structure_score = report['structure_score']
         quality_score = report['quality_score']
         security_score = report['security_score']
 
-        await conn.execute(
+        await pool.execute(
             """
             UPDATE analyses SET
                 status = 'completed',
-                completed_at = $1,
-                overall_score = $2,
-                structure_score = $3,
-                quality_score = $4,
-                security_score = $5
-            WHERE id = $6
+                completed_at = NOW(),
+                overall_score = $1,
+                structure_score = $2,
+                quality_score = $3,
+                security_score = $4
+            WHERE id = $5
             """,
-            datetime.now(),
             overall_score,
             structure_score,
             quality_score,
             security_score,
             analysis_id
         )
-        await conn.execute(
+        await pool.execute(
             "UPDATE projects SET last_analysis_id = $1 WHERE id = $2",
             analysis_id,
             project_id
         )
 
-    except Exception as e:
-        if conn:
-            try:
-                await conn.execute(
-                    "UPDATE analyses SET status = 'failed' WHERE id = $1",
-                    analysis_id
-                )
-            except:
-                pass
+    except Exception:
+        try:
+            await pool.execute(
+                "UPDATE analyses SET status = 'failed' WHERE id = $1",
+                analysis_id
+            )
+        except:
+            pass
         raise
     finally:
-        if conn:
-            await conn.close()
-        if project_path and os.path.exists(project_path):
-            shutil.rmtree(project_path)
+        if project_path:
+            await asyncio.to_thread(shutil.rmtree, project_path, ignore_errors=True)
 
 MAX_FILE_SIZE = 50 * 1024 * 1024
 MAX_TOTAL_SIZE = 200 * 1024 * 1024
@@ -211,6 +190,14 @@ MALICIOUS_CONTENT_PATTERNS = [
     rb'shell=True',
 ]
 
+# Each list fused into one alternation, so a check is a single regex sweep
+# instead of one search per pattern. Content patterns have always been matched
+# as literal, case-sensitive byte substrings, so they are escaped here
+SUSPICIOUS_FILENAME_RE = re.compile('|'.join(f'(?:{p})' for p in SUSPICIOUS_PATTERNS), re.IGNORECASE)
+MALICIOUS_CONTENT_RE = re.compile(b'|'.join(re.escape(p) for p in MALICIOUS_CONTENT_PATTERNS))
+UNSAFE_FILENAME_CHARS_RE = re.compile(r'[<>:"|?*]')
+REPEATED_DOTS_RE = re.compile(r'\.\.+')
+
 
 class GitHubRepo(BaseModel):
     """GitHub repository information"""
@@ -258,23 +245,13 @@ class GitHubReposResponse(BaseModel):
     repositories: List[GitHubRepo]
 
 
-async def get_or_create_user(user_id: str) -> str:
-    """Get existing user or create new user from auth ID"""
-    conn = await get_db_connection()
-    try:
-        db_user_id = convert_user_id_to_uuid(user_id)
-
-        user_row = await conn.fetchrow(
-            "SELECT id FROM users WHERE id = $1",
-            db_user_id
-        )
-
-        if user_row:
-            return str(user_row["id"])
-        else:
-            return db_user_id
-    finally:
-        await conn.close()
+def get_or_create_user(user_id: str) -> str:
+    """
+    Resolve the database user ID for an auth ID.
+    The ID is derived from the auth ID alone, so no database lookup is
+    needed; queries that need the user row join or check it themselves.
+    """
+    return convert_user_id_to_uuid(user_id)
 
 
 def get_mock_github_user_data() -> dict:
@@ -297,23 +274,14 @@ def validate_mock_github_repo(repo_owner: str, repo_name: str) -> dict:
     }
 
 
-async def get_db_connection():
-    """Get database connection"""
-    db_url = os.getenv("DATABASE_URL_DEV")
-    if not db_url:
-        raise ValueError("DATABASE_URL_DEV not found in environment variables")
-    return await asyncpg.connect(db_url)
-
-
 @router.get("")
 @rate_limit("30/minute")
 async def get_projects(request: Request, user: AuthorizedUser) -> List[ProjectResponse]:
     """Get all projects for the authenticated user"""
-    db_user_id = await get_or_create_user(user.sub)
+    db_user_id = get_or_create_user(user.sub)
 
-    conn = None
     try:
-        conn = await get_db_connection()
+        pool = await get_app_db_pool()
 
         projects_query = """
             SELECT p.id, p.repo_name, p.repo_owner, p.repo_url, p.project_source,
@@ -327,7 +295,7 @@ async def get_projects(request: Request, user: AuthorizedUser) -> List[ProjectRe
             ORDER BY p.id DESC
         """
 
-        rows = await conn.fetch(projects_query, db_user_id)
+        rows = await pool.fetch(projects_query, db_user_id)
 
         projects = []
 
@@ -361,9 +329,6 @@ async def get_projects(request: Request, user: AuthorizedUser) -> List[ProjectRe
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.get("/github/repositories", response_model=GitHubReposResponse)
@@ -376,6 +341,9 @@ async def get_github_repositories(request: Request, user: AuthorizedUser) -> Git
         from app.apis.github_auth import get_github_repositories as fetch_github_repos
 
         github_response = await fetch_github_repos(request, user)
+        if isinstance(github_response, Response):
+            # The GitHub endpoint answers with a pre-encoded JSON body
+            github_response = json_loads(github_response.body)
 
         repos = []
         for repo_data in github_response["repositories"]:
@@ -394,7 +362,7 @@ async def get_github_repositories(request: Request, user: AuthorizedUser) -> Git
         return GitHubReposResponse(repositories=repos)
 
     except Exception as e:
-        print(f"❌ Error fetching GitHub repositories: {str(e)}")
+        logger.error("Error fetching GitHub repositories: %s", e)
         mock_repos = [
             GitHubRepo(
                 id=1,
@@ -446,7 +414,7 @@ async def validate_github_repo(repo_data: dict, user: AuthorizedUser) -> dict:
             "repository": repo_data
         }
     except Exception as e:
-        print(f"❌ API: GitHub repo validation error: {str(e)}")
+        logger.error("API: GitHub repo validation error: %s", e)
         raise HTTPException(status_code=500, detail="Repository validation failed")
 
 
@@ -456,47 +424,35 @@ async def create_project(request: Request, project_data: ProjectCreateRequest, u
     """Create a new project with comprehensive logging"""
     operation_start = time.time()
 
-    print(f"📊 API: POST /projects - Starting request for user {user.sub}")
-    print(f"📝 API: Project details - repo: {project_data.repo_owner}/{project_data.repo_name}, url: {project_data.repo_url}")
+    logger.debug("API: POST /projects - Starting request for user %s", user.sub)
+    logger.debug("API: Project details - repo: %s/%s, url: %s", project_data.repo_owner, project_data.repo_name, project_data.repo_url)
 
-    conn = None
     try:
         if not project_data.repo_name or not project_data.repo_owner:
-            print(f"❌ API: Invalid input - missing repo_name or repo_owner")
+            logger.warning("API: Invalid input - missing repo_name or repo_owner")
             raise HTTPException(status_code=400, detail="Repository name and owner are required")
 
-        db_user_id = await get_or_create_user(user.sub)
-        print(f"🔄 ID Conversion: {user.sub} -> {db_user_id}")
+        db_user_id = get_or_create_user(user.sub)
+
+        pool = await get_app_db_pool()
 
-        conn = await get_db_connection()
-        
-        check_start = time.time()
-        print(f"🔍 Database: Checking for existing project {project_data.repo_owner}/{project_data.repo_name}")        
-        existing_query = """
-            SELECT id FROM projects 
-            WHERE user_id = $1 AND repo_owner = $2 AND repo_name = $3
-        """
-        existing = await conn.fetchrow(existing_query, db_user_id, project_data.repo_owner, project_data.repo_name)        
-        check_time = (time.time() - check_start) * 1000
-        print(f"✅ Database: Duplicate check completed in {check_time:.2f}ms")
-        
-        if existing:
-            print(f"⚠️ API: Project already exists with ID {existing['id']}")
-            raise HTTPException(
-                status_code=409, 
-                detail=f"Project {project_data.repo_owner}/{project_data.repo_name} already exists"
-            )
-        
         insert_start = time.time()
-        print(f"➕ Database: Creating new project")
+        logger.debug("Database: Creating project %s/%s", project_data.repo_owner, project_data.repo_name)
 
+        # Duplicate check and insert in one statement: NOT EXISTS covers the
+        # common case, ON CONFLICT a concurrent insert racing past it
         insert_query = """
             INSERT INTO projects (user_id, repo_name, repo_owner, repo_url, project_source, created_at)
-            VALUES ($1, $2, $3, $4, $5, NOW())
+            SELECT $1, $2, $3, $4, $5, NOW()
+            WHERE NOT EXISTS (
+                SELECT 1 FROM projects
+                WHERE user_id = $1 AND repo_owner = $3 AND repo_name = $2
+            )
+            ON CONFLICT DO NOTHING
             RETURNING id, repo_name, repo_owner, repo_url, created_at
         """
 
-        new_project = await conn.fetchrow(
+        new_project = await pool.fetchrow(
             insert_query,
             db_user_id,
             project_data.repo_name,
@@ -504,13 +460,20 @@ async def create_project(request: Request, project_data: ProjectCreateRequest, u
             project_data.repo_url,
             'github'
         )
+
+        if new_project is None:
+            logger.warning("API: Project %s/%s already exists", project_data.repo_owner, project_data.repo_name)
+            raise HTTPException(
+                status_code=409, 
+                detail=f"Project {project_data.repo_owner}/{project_data.repo_name} already exists"
+            )
         
         insert_time = (time.time() - insert_start) * 1000
         total_time = (time.time() - operation_start) * 1000
         
-        print(f"✅ Database: Project created successfully in {insert_time:.2f}ms")
-        print(f"🎉 API: POST /projects completed successfully in {total_time:.2f}ms")
-        print(f"📈 API: New project ID: {new_project['id']}")
+        logger.debug("Database: Project created successfully in %.2fms", insert_time)
+        logger.debug("API: POST /projects completed successfully in %.2fms", total_time)
+        logger.debug("API: New project ID: %s", new_project['id'])
         
         return ProjectResponse(
             id=new_project["id"],
@@ -525,31 +488,24 @@ async def create_project(request: Request, project_data: ProjectCreateRequest, u
         raise
     except asyncpg.UniqueViolationError as e:
         error_time = (time.time() - operation_start) * 1000
-        print(f"⚠️ Database: Unique constraint violation after {error_time:.2f}ms - {str(e)}")
+        logger.warning("Database: Unique constraint violation after %.2fms - %s", error_time, e)
         raise HTTPException(
             status_code=409, 
-            detail=f"Project {request.repo_owner}/{request.repo_name} already exists"
+            detail=f"Project {project_data.repo_owner}/{project_data.repo_name} already exists"
         )
     except asyncpg.PostgresError as e:
         error_time = (time.time() - operation_start) * 1000
-        print(f"❌ Database: PostgreSQL error after {error_time:.2f}ms - {str(e)}")
-        print(f"📊 Database: Error code: {e.sqlstate}")
+        logger.error("Database: PostgreSQL error after %.2fms - %s", error_time, e)
+        logger.debug("Database: Error code: %s", e.sqlstate)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
         error_time = (time.time() - operation_start) * 1000
-        print(f"❌ API: Unexpected error in POST /projects after {error_time:.2f}ms - {str(e)}")
-        print(f"📊 API: Full error traceback:")
-        traceback.print_exc()
+        logger.exception("API: Unexpected error in POST /projects after %.2fms - %s", error_time, e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-    finally:
-        if conn:
-            await conn.close()
-            print(f"🔌 Database: Connection closed")
 
 
 def convert_user_id_to_uuid(user_id: str) -> str:
     """Convert string user ID to UUID for database compatibility"""
-    print(f"🔄 ID Conversion: {user_id} -> {user_id} (UUID)")
     return user_id
 
 
@@ -561,36 +517,35 @@ async def delete_project(project_id: int, user: AuthorizedUser):
     Only the project owner can delete their projects.
     """
     operation_start = time.time()
-    db_user_id = await get_or_create_user(user.sub)
+    db_user_id = get_or_create_user(user.sub)
 
-    print(f"🗑️ API: DELETE /projects/{project_id} - Starting request for user {user.sub} (DB ID: {db_user_id})")
+    logger.debug("API: DELETE /projects/%s - Starting request for user %s (DB ID: %s)", project_id, user.sub, db_user_id)
 
-    conn = None
     try:
-        conn = await get_db_connection()
+        pool = await get_app_db_pool()
 
-        project_record = await conn.fetchrow(
+        project_record = await pool.fetchrow(
             "SELECT id, repo_name, repo_owner, project_source FROM projects WHERE id = $1 AND user_id = $2",
             project_id, db_user_id
         )
 
         if not project_record:
-            print(f"❌ API: Project {project_id} not found or access denied for user {db_user_id}")
+            logger.warning("API: Project %s not found or access denied for user %s", project_id, db_user_id)
             raise HTTPException(status_code=404, detail="Project not found or access denied")
 
-        print(f"🔍 API: Found project {project_record['repo_owner']}/{project_record['repo_name']} (source: {project_record['project_source']})")
+        logger.debug("API: Found project %s/%s (source: %s)", project_record['repo_owner'], project_record['repo_name'], project_record['project_source'])
 
-        delete_result = await conn.execute(
+        delete_result = await pool.execute(
             "DELETE FROM projects WHERE id = $1 AND user_id = $2",
             project_id, db_user_id
         )
 
         if delete_result == "DELETE 0":
-            print(f"❌ API: No project deleted - unexpected error")
+            logger.error("API: No project deleted - unexpected error")
             raise HTTPException(status_code=500, detail="Failed to delete project")
 
         total_time = (time.time() - operation_start) * 1000
-        print(f"✅ API: Project {project_id} deleted successfully in {total_time:.2f}ms")
+        logger.debug("API: Project %s deleted successfully in %.2fms", project_id, total_time)
 
         return {
             "message": "Project deleted successfully",
@@ -601,12 +556,8 @@ async def delete_project(project_id: int, user: AuthorizedUser):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ API: Delete project error: {str(e)}")
-        print(f"❌ API: Traceback: {traceback.format_exc()}")
+        logger.exception("API: Delete project error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to delete project")
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.post("/{project_id}/analyze", status_code=202)
@@ -614,43 +565,51 @@ async def start_analysis(project_id: int, user: AuthorizedUser):
     """
     Starts a new analysis for a project.
     """
-    conn = None
     try:
-        db_user_id = await get_or_create_user(user.sub)
-        conn = await get_db_connection()
+        db_user_id = get_or_create_user(user.sub)
+        pool = await get_app_db_pool()
 
-        project_record = await conn.fetchrow(
-            "SELECT repo_url FROM projects WHERE id = $1 AND user_id = $2",
-            project_id, db_user_id
-        )
-        if not project_record:
-            raise HTTPException(status_code=404, detail="Project not found or access denied")
-
-        user_record = await conn.fetchrow(
-            "SELECT github_access_token FROM users WHERE id = $1", db_user_id
-        )
-        if not user_record or not user_record['github_access_token']:
-            raise HTTPException(status_code=403, detail="User GitHub token not found.")
-        
-        analysis_id = await conn.fetchval(
+        # Ownership check, token check, analysis insert and last_analysis_id
+        # update in a single round trip; nothing is written unless both checks pass
+        record = await pool.fetchrow(
             """
-            INSERT INTO analyses (project_id, status, created_at, overall_score, structure_score, quality_score, security_score)
-            VALUES ($1, 'pending', NOW(), 0, 0, 0, 0)
-            RETURNING id
+            WITH project AS (
+                SELECT id, repo_url FROM projects WHERE id = $1 AND user_id = $2
+            ),
+            token AS (
+                SELECT 1 FROM users
+                WHERE id = $3 AND github_access_token IS NOT NULL AND github_access_token <> ''
+            ),
+            new_analysis AS (
+                INSERT INTO analyses (project_id, status, created_at, overall_score, structure_score, quality_score, security_score)
+                SELECT id, 'pending', NOW(), 0, 0, 0, 0 FROM project
+                WHERE EXISTS (SELECT 1 FROM token)
+                RETURNING id, project_id
+            ),
+            updated_project AS (
+                UPDATE projects SET last_analysis_id = new_analysis.id
+                FROM new_analysis
+                WHERE projects.id = new_analysis.project_id
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM project) AS project_found,
+                (SELECT repo_url FROM project) AS repo_url,
+                EXISTS (SELECT 1 FROM token) AS has_token,
+                (SELECT id FROM new_analysis) AS analysis_id
             """,
-            project_id
+            project_id, db_user_id, db_user_id
         )
+        if not record['project_found']:
+            raise HTTPException(status_code=404, detail="Project not found or access denied")
+        if not record['has_token']:
+            raise HTTPException(status_code=403, detail="User GitHub token not found.")
 
-        await conn.execute(
-            "UPDATE projects SET last_analysis_id = $1 WHERE id = $2",
-            analysis_id,
-            project_id
-        )
+        analysis_id = record['analysis_id']
 
         asyncio.create_task(run_project_analysis(
             project_id=project_id,
             analysis_id=analysis_id,
-            repo_url=project_record['repo_url']
+            repo_url=record['repo_url']
         ))
 
         return {"message": "Analysis started", "analysis_id": analysis_id}
@@ -659,9 +618,107 @@ async def start_analysis(project_id: int, user: AuthorizedUser):
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if conn:
-            await conn.close()
+
+
+GITHUB_CACHE_SIZE = 512
+GITHUB_CACHE_FRESH_SECONDS = 60
+_github_cache: "OrderedDict[tuple, Tuple[float, str, Any]]" = OrderedDict()
+
+async def get_github_cached(
+    cache_key: tuple,
+    url: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    transform: Callable[[bytes], Any] = json_loads
+) -> Tuple[int, Any]:
+    """
+    GET a GitHub API resource through a small in-process ETag cache.
+    Entries younger than GITHUB_CACHE_FRESH_SECONDS are served without asking
+    GitHub; older ones are revalidated with If-None-Match, and a 304 reuses
+    the already transformed value. Keys carry the user ID, so a cached
+    private resource is only ever served back to the user who fetched it.
+    Returns the status code and the transformed body (None unless 200).
+    """
+    now = time.monotonic()
+    cached = _github_cache.get(cache_key)
+    if cached is not None:
+        _github_cache.move_to_end(cache_key)
+        if now - cached[0] < GITHUB_CACHE_FRESH_SECONDS:
+            return 200, cached[2]
+        headers = {**headers, "If-None-Match": cached[1]}
+
+    response = await get_github_client().get(url, headers=headers, params=params)
+    if response.status_code == 304 and cached is not None:
+        _github_cache[cache_key] = (now, cached[1], cached[2])
+        return 200, cached[2]
+    if response.status_code != 200:
+        return response.status_code, None
+
+    value = transform(response.content)
+    etag = response.headers.get("ETag")
+    if etag:
+        _github_cache[cache_key] = (now, etag, value)
+        _github_cache.move_to_end(cache_key)
+        if len(_github_cache) > GITHUB_CACHE_SIZE:
+            _github_cache.popitem(last=False)
+    return 200, value
+
+
+def build_file_tree(tree_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Nest the flat entries of a recursive GitHub tree into sorted folders and files.
+    Sorting on the split path puts every folder directly before its contents,
+    with siblings in name order, so one pass over a stack of open folders
+    builds the whole tree.
+    """
+    entries = sorted(
+        ((item['path'].split('/'), item) for item in tree_items if item['type'] in ('blob', 'tree')),
+        key=itemgetter(0)
+    )
+    root_items: List[Dict[str, Any]] = []
+    stack: List[Tuple[List[str], List[Dict[str, Any]]]] = [([], root_items)]
+
+    for path_parts, item in entries:
+        while len(stack) > 1:
+            prefix = stack[-1][0]
+            if len(prefix) < len(path_parts) and path_parts[:len(prefix)] == prefix:
+                break
+            stack.pop()
+
+        # Folders GitHub did not list on their own are created on the way down
+        for i in range(len(stack) - 1, len(path_parts) - 1):
+            folder = {
+                'type': 'folder',
+                'path': '/'.join(path_parts[:i + 1]),
+                'name': path_parts[i],
+                'children': []
+            }
+            stack[-1][1].append(folder)
+            stack.append((path_parts[:i + 1], folder['children']))
+
+        if item['type'] == 'blob':
+            stack[-1][1].append({
+                'type': 'file',
+                'path': item['path'],
+                'name': path_parts[-1]
+            })
+        else:
+            folder = {
+                'type': 'folder',
+                'path': item['path'],
+                'name': path_parts[-1],
+                'children': []
+            }
+            stack[-1][1].append(folder)
+            stack.append((path_parts, folder['children']))
+
+    return root_items
+
+
+def parse_file_tree(content: bytes) -> Tuple[List[Dict[str, Any]], int]:
+    """Decode a recursive tree response into the nested file tree and its entry count"""
+    tree_items = json_loads(content)['tree']
+    return build_file_tree(tree_items), len(tree_items)
 
 
 @router.get("/{project_id}/files")
@@ -671,139 +728,74 @@ async def get_project_files(project_id: int, user: AuthorizedUser, branch: str =
     Returns the complete file tree for the specified branch.
     """
     operation_start = time.time()
-    db_user_id = await get_or_create_user(user.sub)
+    db_user_id = get_or_create_user(user.sub)
 
-    print(f"📁 API: GET /projects/{project_id}/files - Starting request for user {user.sub} (DB ID: {db_user_id}, branch: {branch})")
+    logger.debug("API: GET /projects/%s/files - Starting request for user %s (DB ID: %s, branch: %s)", project_id, user.sub, db_user_id, branch)
 
-    conn = None
     try:
-        conn = await get_db_connection()
+        pool = await get_app_db_pool()
 
-        project_record = await conn.fetchrow(
+        project_record = await pool.fetchrow(
             "SELECT repo_name, repo_owner, repo_url, project_source FROM projects WHERE id = $1 AND user_id = $2",
             project_id, db_user_id
         )
 
         if not project_record:
-            print(f"❌ API: Project {project_id} not found or access denied for user {db_user_id}")
+            logger.warning("API: Project %s not found or access denied for user %s", project_id, db_user_id)
             raise HTTPException(status_code=404, detail="Project not found or access denied")
 
-        print(f"✅ API: Found project {project_record['repo_owner']}/{project_record['repo_name']} (source: {project_record['project_source']})")
+        logger.debug("API: Found project %s/%s (source: %s)", project_record['repo_owner'], project_record['repo_name'], project_record['project_source'])
 
         if project_record['project_source'] != 'github':
-            print(f"❌ API: Project source '{project_record['project_source']}' not supported for file structure")
+            logger.warning("API: Project source '%s' not supported for file structure", project_record['project_source'])
             raise HTTPException(status_code=400, detail="File structure only available for GitHub projects")
 
-        print(f"🔑 API: Fetching GitHub token for user {db_user_id}")
-        user_record = await conn.fetchrow(
+        logger.debug("API: Fetching GitHub token for user %s", db_user_id)
+        user_record = await pool.fetchrow(
             "SELECT github_access_token FROM users WHERE id = $1", db_user_id
         )
         if not user_record or not user_record['github_access_token']:
-            print(f"❌ API: No GitHub token found for user {db_user_id}")
+            logger.warning("API: No GitHub token found for user %s", db_user_id)
             raise HTTPException(status_code=403, detail="GitHub token not found")
 
-        print(f"✅ API: GitHub token found for user {db_user_id}")
-
-        import requests
+        logger.debug("API: GitHub token found for user %s", db_user_id)
 
         github_token = decrypt_token(user_record['github_access_token'])
         repo_owner = project_record['repo_owner']
         repo_name = project_record['repo_name']
+        headers = github_api_headers(github_token)
 
+        # The tree request does not depend on the branch listing, so both go
+        # out together; the branch check below still decides the response
         branches_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/branches"
-        branches_response = requests.get(
-            branches_url,
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
+        tree_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/trees/{branch}"
+        (branches_status, available_branches), (tree_status, tree_result) = await asyncio.gather(
+            get_github_cached(
+                ("branches", db_user_id, repo_owner, repo_name), branches_url, headers,
+                transform=lambda content: [b['name'] for b in json_loads(content)]
+            ),
+            get_github_cached(
+                ("tree", db_user_id, repo_owner, repo_name, branch), tree_url, headers,
+                params={"recursive": 1}, transform=parse_file_tree
+            )
         )
 
-        if branches_response.status_code != 200:
-            print(f"❌ API: Failed to fetch branches: {branches_response.status_code}")
+        if branches_status != 200:
+            logger.error("API: Failed to fetch branches: %s", branches_status)
             raise HTTPException(status_code=500, detail="Failed to fetch repository branches")
 
-        branches_data = branches_response.json()
-        available_branches = [b['name'] for b in branches_data]
-
         if branch not in available_branches:
-            print(f"❌ API: Branch '{branch}' not found in {available_branches}")
+            logger.warning("API: Branch '%s' not found in %s", branch, available_branches)
             raise HTTPException(status_code=404, detail=f"Branch '{branch}' not found")
 
-        tree_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/git/trees/{branch}?recursive=1"
-        tree_response = requests.get(
-            tree_url,
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
-        )
-
-        if tree_response.status_code != 200:
-            print(f"❌ API: Failed to fetch file tree: {tree_response.status_code}")
+        if tree_status != 200:
+            logger.error("API: Failed to fetch file tree: %s", tree_status)
             raise HTTPException(status_code=500, detail="Failed to fetch repository file tree")
 
-        tree_data = tree_response.json()
-
-        def build_file_tree(tree_items):
-            root_items = {}
-
-            for item in tree_items:
-                if item['type'] in ['blob', 'tree']:
-                    path_parts = item['path'].split('/')
-                    current_level = root_items
-
-                    for i, part in enumerate(path_parts):
-                        if i == len(path_parts) - 1:
-                            if item['type'] == 'blob':
-                                current_level[part] = {
-                                    'type': 'file',
-                                    'path': item['path'],
-                                    'name': part
-                                }
-                            else:
-                                if part not in current_level:
-                                    current_level[part] = {
-                                        'type': 'folder',
-                                        'path': item['path'],
-                                        'name': part,
-                                        'children': {}
-                                    }
-                        else:
-                            if part not in current_level:
-                                current_level[part] = {
-                                    'type': 'folder',
-                                    'path': '/'.join(path_parts[:i+1]),
-                                    'name': part,
-                                    'children': {}
-                                }
-                            current_level = current_level[part]['children']
-
-            def dict_to_list(items_dict):
-                result = []
-                for name, item in sorted(items_dict.items()):
-                    if item['type'] == 'folder':
-                        children = dict_to_list(item['children'])
-                        result.append({
-                            'type': 'folder',
-                            'path': item['path'],
-                            'name': item['name'],
-                            'children': children
-                        })
-                    else:
-                        result.append({
-                            'type': 'file',
-                            'path': item['path'],
-                            'name': item['name']
-                        })
-                return result
-
-            return dict_to_list(root_items)
-
-        file_tree = build_file_tree(tree_data['tree'])
+        file_tree, item_count = tree_result
 
         total_time = (time.time() - operation_start) * 1000
-        print(f"✅ API: File tree fetched successfully in {total_time:.2f}ms ({len(tree_data['tree'])} items)")
+        logger.debug("API: File tree fetched successfully in %.2fms (%s items)", total_time, item_count)
 
         return {
             "repository": {
@@ -819,12 +811,8 @@ async def get_project_files(project_id: int, user: AuthorizedUser, branch: str =
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ API: Get project files error: {str(e)}")
-        print(f"❌ API: Traceback: {traceback.format_exc()}")
+        logger.exception("API: Get project files error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch project files")
-    finally:
-        if conn:
-            await conn.close()
 
 
 @router.get("/{project_id}/files/content")
@@ -833,56 +821,47 @@ async def get_file_content(project_id: int, file_path: str, user: AuthorizedUser
     Get content of a specific file from a GitHub project.
     """
     operation_start = time.time()
-    db_user_id = await get_or_create_user(user.sub)
+    db_user_id = get_or_create_user(user.sub)
 
-    print(f"📄 API: GET /projects/{project_id}/files/content - File: {file_path} (branch: {branch})")
+    logger.debug("API: GET /projects/%s/files/content - File: %s (branch: %s)", project_id, file_path, branch)
 
-    conn = None
     try:
-        conn = await get_db_connection()
+        pool = await get_app_db_pool()
 
-        project_record = await conn.fetchrow(
+        project_record = await pool.fetchrow(
             "SELECT repo_name, repo_owner, project_source FROM projects WHERE id = $1 AND user_id = $2",
             project_id, db_user_id
         )
 
         if not project_record:
-            print(f"❌ API: Project {project_id} not found or access denied for user {db_user_id}")
+            logger.warning("API: Project %s not found or access denied for user %s", project_id, db_user_id)
             raise HTTPException(status_code=404, detail="Project not found or access denied")
 
         if project_record['project_source'] != 'github':
             raise HTTPException(status_code=400, detail="File content only available for GitHub projects")
 
-        user_record = await conn.fetchrow(
+        user_record = await pool.fetchrow(
             "SELECT github_access_token FROM users WHERE id = $1", db_user_id
         )
         if not user_record or not user_record['github_access_token']:
             raise HTTPException(status_code=403, detail="GitHub token not found")
 
-        import requests
-        import base64
-
         github_token = decrypt_token(user_record['github_access_token'])
         repo_owner = project_record['repo_owner']
         repo_name = project_record['repo_name']
 
-        file_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file_path}?ref={branch}"
-        file_response = requests.get(
-            file_url,
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json"
-            }
+        file_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file_path}"
+        file_status, file_data = await get_github_cached(
+            ("contents", db_user_id, repo_owner, repo_name, branch, file_path), file_url,
+            github_api_headers(github_token), params={"ref": branch}
         )
 
-        if file_response.status_code == 404:
+        if file_status == 404:
             raise HTTPException(status_code=404, detail="File not found")
-        elif file_response.status_code != 200:
-            print(f"❌ API: Failed to fetch file content: {file_response.status_code}")
+        elif file_status != 200:
+            logger.error("API: Failed to fetch file content: %s", file_status)
             raise HTTPException(status_code=500, detail="Failed to fetch file content")
 
-        file_data = file_response.json()
-
         if file_data.get('encoding') == 'base64':
             try:
                 content = base64.b64decode(file_data['content']).decode('utf-8')
@@ -892,7 +871,7 @@ async def get_file_content(project_id: int, file_path: str, user: AuthorizedUser
             raise HTTPException(status_code=400, detail="Unsupported file encoding")
 
         total_time = (time.time() - operation_start) * 1000
-        print(f"✅ API: File content fetched successfully in {total_time:.2f}ms")
+        logger.debug("API: File content fetched successfully in %.2fms", total_time)
 
         return {
             "content": content,
@@ -904,18 +883,20 @@ async def get_file_content(project_id: int, file_path: str, user: AuthorizedUser
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ API: Get file content error: {str(e)}")
-        print(f"❌ API: Traceback: {traceback.format_exc()}")
+        logger.exception("API: Get file content error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch file content")
-    finally:
-        if conn:
-            await conn.close()
 
 
+def is_suspicious_filename(filename: str) -> bool:
+    """Check a filename against all SUSPICIOUS_PATTERNS in one search"""
+    return SUSPICIOUS_FILENAME_RE.search(filename) is not None
+
+def contains_malicious_content(content: bytes) -> bool:
+    """Check file content against all MALICIOUS_CONTENT_PATTERNS in one search"""
+    return MALICIOUS_CONTENT_RE.search(content) is not None
+
 def validate_filename_security(filename: str) -> tuple[bool, str]:
     """Enhanced filename security validation"""
-    import re
-
     if len(filename) > MAX_FILENAME_LENGTH:
         return False, f"Filename too long (max {MAX_FILENAME_LENGTH} characters)"
 
@@ -923,9 +904,8 @@ def validate_filename_security(filename: str) -> tuple[bool, str]:
     if ext in DANGEROUS_EXTENSIONS:
         return False, f"Dangerous file type: {ext}"
 
-    for pattern in SUSPICIOUS_PATTERNS:
-        if re.search(pattern, filename, re.IGNORECASE):
-            return False, f"Suspicious filename pattern detected"
+    if is_suspicious_filename(filename):
+        return False, f"Suspicious filename pattern detected"
 
     if '\x00' in filename or any(ord(c) < 32 for c in filename if c not in '\t\n\r'):
         return False, "Invalid characters in filename"
@@ -943,9 +923,8 @@ def validate_file_size(file_size: int) -> bool:
 
 def validate_file_content_security(content: bytes, filename: str) -> tuple[bool, str]:
     """Basic content security validation"""
-    for pattern in MALICIOUS_CONTENT_PATTERNS:
-        if pattern in content:
-            return False, f"Potentially malicious content detected in {filename}"
+    if contains_malicious_content(content):
+        return False, f"Potentially malicious content detected in {filename}"
 
     if b'\x00' in content and not filename.endswith(('.pyc', '.pyo')):
         null_ratio = content.count(b'\x00') / len(content) if content else 0
@@ -959,10 +938,8 @@ def validate_file_content_security(content: bytes, filename: str) -> tuple[bool,
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe storage"""
-    import re
-
-    filename = re.sub(r'[<>:"|?*]', '_', filename)
-    filename = re.sub(r'\.\.+', '.', filename)
+    filename = UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
+    filename = REPEATED_DOTS_RE.sub('.', filename)
     filename = filename.strip('. ')
 
     if not filename:
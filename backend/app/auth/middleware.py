@@ -46,6 +46,7 @@ def get_authorized_user(
             algorithms=["ES256"],
             audience=auth_config.audience,
         )
+        request.state.user_sub = payload["sub"]
         return User(
             sub=payload["sub"],
             user_id=payload.get("user_id"),
@@ -0,0 +1,59 @@
+import logging
+from typing import Any, Dict, Optional
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from app.config import settings
+from app.libs.utils.json_utils import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever analyzers or scoring change, so stale reports stop being served
+ANALYSIS_CACHE_VERSION = 1
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+_redis_client: Optional[redis.Redis] = None
+
+def _get_redis_client() -> redis.Redis:
+    """Get the shared Redis client, creating it on first use"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.redis_url)
+    return _redis_client
+
+def _cache_key(commit_sha: str) -> str:
+    return f"analysis_report:v{ANALYSIS_CACHE_VERSION}:{commit_sha}"
+
+async def get_cached_report(commit_sha: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Looks up the analysis report of a commit that was already analyzed.
+
+    Args:
+        commit_sha: Commit the checkout is at, or None if unknown
+
+    Returns:
+        Optional[Dict[str, Any]]: Cached report, or None on a miss or when
+        the cache is unavailable
+    """
+    if not commit_sha:
+        return None
+    try:
+        cached = await _get_redis_client().get(_cache_key(commit_sha))
+    except RedisError as e:
+        logger.warning("Analysis cache unavailable: %s", e)
+        return None
+    return json_loads(cached) if cached else None
+
+async def store_cached_report(commit_sha: Optional[str], report: Dict[str, Any]) -> None:
+    """
+    Stores the analysis report of a commit for later requests.
+
+    Args:
+        commit_sha: Commit the checkout is at, or None if unknown
+        report: Report produced by run_analysis
+    """
+    if not commit_sha:
+        return
+    try:
+        await _get_redis_client().set(_cache_key(commit_sha), json_dumps(report), ex=ANALYSIS_CACHE_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning("Analysis cache unavailable: %s", e)
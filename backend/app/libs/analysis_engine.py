@@ -1,5 +1,8 @@
+import asyncio
 import logging
-from typing import List, Dict, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 from app.libs.models import IssueBase
 from app.analyzers.quality import RuffAnalyzer
 from app.analyzers.security import BanditAnalyzer
@@ -42,15 +45,20 @@ class AnalysisEngine:
 
         all_issues = []
 
-        for analyzer in self.analyzers:
-            try:
+        with ThreadPoolExecutor(max_workers=len(self.analyzers)) as executor:
+            futures = []
+            for analyzer in self.analyzers:
                 self.logger.info(f"Running {analyzer.name}")
-                issues = analyzer.analyze(project_path)
-                all_issues.extend(issues)
-                self.logger.info(f"{analyzer.name} found {len(issues)} issues")
-            except Exception as e:
-                self.logger.error(f"Error in {analyzer.name}: {e}")
-                continue
+                futures.append((analyzer, executor.submit(analyzer.analyze, project_path)))
+
+            for analyzer, future in futures:
+                try:
+                    issues = future.result()
+                    all_issues.extend(issues)
+                    self.logger.info(f"{analyzer.name} found {len(issues)} issues")
+                except Exception as e:
+                    self.logger.error(f"Error in {analyzer.name}: {e}")
+                    continue
 
         scores = self._calculate_scores(all_issues)
         structure_analysis = self.structure_scorer.calculate_structure_score(all_issues)
@@ -194,3 +202,28 @@ class AnalysisEngine:
 def run_analysis(project_path: str) -> Dict[str, Any]:
     engine = AnalysisEngine()
     return engine.run_analysis(project_path)
+
+
+_analysis_executor: Optional[ThreadPoolExecutor] = None
+
+def get_analysis_executor() -> ThreadPoolExecutor:
+    """Return the bounded pool that runs analyses, kept apart from the loop's default executor"""
+    global _analysis_executor
+    if _analysis_executor is None:
+        _analysis_executor = ThreadPoolExecutor(
+            max_workers=max(2, (os.cpu_count() or 2) // 2),
+            thread_name_prefix="analysis"
+        )
+    return _analysis_executor
+
+def close_analysis_executor() -> None:
+    """Stop the analysis workers on shutdown"""
+    global _analysis_executor
+    if _analysis_executor is not None:
+        _analysis_executor.shutdown(wait=False, cancel_futures=True)
+        _analysis_executor = None
+
+async def run_analysis_async(project_path: str) -> Dict[str, Any]:
+    """Run an analysis on the dedicated pool so concurrent analyses can't starve DNS lookups or other to_thread work"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_analysis_executor(), run_analysis, project_path)
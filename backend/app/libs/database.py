@@ -1,12 +1,53 @@
 import os
+import asyncio
 import asyncpg
+from typing import Dict
 from app.env import mode, Mode
-async def get_db_connection():
+# One pool per DSN, so the admin and application URLs share a pool when they
+# point at the same database
+_db_pools: Dict[str, asyncpg.Pool] = {}
+_db_pool_lock = asyncio.Lock()
+def get_db_url() -> str:
     if mode == Mode.PROD:
         db_url = os.getenv("DATABASE_URL_ADMIN_PROD")
     else:
         db_url = os.getenv("DATABASE_URL_ADMIN_DEV")
     if not db_url:
         raise ValueError(f"Database URL not found for mode: {mode}")
-    conn = await asyncpg.connect(db_url)
+    return db_url
+def get_app_db_url() -> str:
+    db_url = os.getenv("DATABASE_URL_DEV")
+    if not db_url:
+        raise ValueError("DATABASE_URL_DEV not found in environment variables")
+    return db_url
+async def get_db_connection():
+    conn = await asyncpg.connect(get_db_url())
     return conn
+async def _get_pool(db_url: str, min_size: int, max_size: int) -> asyncpg.Pool:
+    """Get the pool for a DSN, creating it on first use"""
+    async with _db_pool_lock:
+        pool = _db_pools.get(db_url)
+        if pool is None:
+            # Statements are prepared once per pooled connection and reused
+            # from asyncpg's statement cache on every later call
+            pool = _db_pools[db_url] = await asyncpg.create_pool(
+                db_url, min_size=min_size, max_size=max_size, statement_cache_size=100
+            )
+    return pool
+async def get_db_pool() -> asyncpg.Pool:
+    """Get the shared admin connection pool, creating it on first use"""
+    return await _get_pool(get_db_url(), min_size=5, max_size=20)
+async def get_app_db_pool() -> asyncpg.Pool:
+    """Get the shared application connection pool, creating it on first use"""
+    return await _get_pool(get_app_db_url(), min_size=2, max_size=10)
+async def open_db_pools() -> None:
+    """Open the admin and application pools before the first request"""
+    await get_db_pool()
+    await get_app_db_pool()
+async def close_db_pools() -> None:
+    """Close every pool that was opened"""
+    async with _db_pool_lock:
+        pools = list(_db_pools.values())
+        _db_pools.clear()
+    for pool in pools:
+        await pool.close()
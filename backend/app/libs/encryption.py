@@ -3,28 +3,46 @@ Encryption utilities for sensitive data like access tokens
 """
 
 import os
+import time
 import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TTL_SECONDS = 300
+
+_token_cache: "OrderedDict[bytes, tuple[float, str]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+_generated_key: "bytes | None" = None
 
 def get_encryption_key() -> bytes:
     """Generate or retrieve encryption key from environment variable"""
+    global _generated_key
     encryption_key = os.getenv("ENCRYPTION_KEY")
     
     if not encryption_key:
-        key = Fernet.generate_key()
-        print(f"🔑 Generated new encryption key. Add to .env: ENCRYPTION_KEY={key.decode()}")
-        return key
+        if _generated_key is None:
+            _generated_key = Fernet.generate_key()
+            print(f"🔑 Generated new encryption key. Add to .env: ENCRYPTION_KEY={_generated_key.decode()}")
+        return _generated_key
     
     return encryption_key.encode()
 
 
+@lru_cache(maxsize=4)
+def fernet_for_key(key: bytes) -> Fernet:
+    """Build the Fernet cipher for a key once; a rotated key simply gets its own entry"""
+    return Fernet(key)
+
+
 def get_fernet() -> Fernet:
     """Get Fernet instance for encryption/decryption"""
-    key = get_encryption_key()
-    return Fernet(key)
+    return fernet_for_key(get_encryption_key())
 
 
 def encrypt_token(token: str) -> str:
@@ -56,3 +74,36 @@ def decrypt_token(encrypted_token: str) -> str:
         if encrypted_token.startswith('gho_') or encrypted_token.startswith('ghp_'):
             return encrypted_token
         return encrypted_token
+
+
+def decrypt_token_cached(encrypted_token: str) -> str:
+    """
+    Decrypt a token, reusing the plaintext for a few minutes.
+    Entries are keyed by a digest of the ciphertext, so the cache holds no
+    token material as keys, and a newly stored token (fresh ciphertext)
+    never hits an old entry.
+    """
+    if not encrypted_token:
+        return encrypted_token
+
+    cache_key = hashlib.blake2b(encrypted_token.encode(), digest_size=16).digest()
+    now = time.monotonic()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached and cached[0] > now:
+            _token_cache.move_to_end(cache_key)
+            return cached[1]
+
+    token = decrypt_token(encrypted_token)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (now + TOKEN_CACHE_TTL_SECONDS, token)
+        _token_cache.move_to_end(cache_key)
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return token
+
+
+def clear_token_cache() -> None:
+    """Drop all cached plaintext tokens"""
+    with _token_cache_lock:
+        _token_cache.clear()
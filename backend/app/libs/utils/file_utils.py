@@ -0,0 +1,32 @@
+import os
+
+DOCS_EXTENSIONS = ('.md', '.txt', '.rst', '.pdf', '.doc', '.docx')
+PROJECT_METADATA_FILES = frozenset(('license', 'changelog', 'authors', 'contributors', 'copying', 'install', 'news', 'readme'))
+
+def has_any_code_file(project_path: str) -> bool:
+    """
+    Checks for a file that is neither documentation nor project metadata,
+    stopping at the first one found.
+
+    Args:
+        project_path: Root of the checked-out project
+
+    Returns:
+        bool: True if the project contains at least one code file
+    """
+    stack = [project_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                if '.git' in name:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                if name.endswith(DOCS_EXTENSIONS):
+                    continue
+                dot = name.rfind('.')
+                if (name[:dot] if dot > 0 else name) not in PROJECT_METADATA_FILES:
+                    return True
+    return False
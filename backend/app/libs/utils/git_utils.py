@@ -0,0 +1,97 @@
+import os
+import asyncio
+import time
+from typing import Optional
+from app.libs.utils.process_utils import run_command
+
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    pygit2 = None
+    PYGIT2_AVAILABLE = False
+
+CLONE_TIMEOUT_SECONDS = 300
+
+async def clone_repository_async(repo_url: str, project_path: str, timeout: int = CLONE_TIMEOUT_SECONDS) -> None:
+    """
+    Shallow-clones the default branch of a repository without tying up a
+    worker thread while git runs: the CLI fallback is awaited as an asyncio
+    subprocess, and only the in-process libgit2 clone is moved to a thread.
+
+    Args:
+        repo_url: URL of the repository to clone
+        project_path: Empty directory to clone into
+        timeout: Maximum clone time in seconds (default 300)
+
+    Raises:
+        Exception: If cloning fails or exceeds the timeout
+    """
+    if PYGIT2_AVAILABLE:
+        await asyncio.to_thread(_clone_in_process, repo_url, project_path, timeout)
+        return
+
+    process = await asyncio.create_subprocess_exec(
+        *_clone_command(repo_url, project_path),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        env=_clone_env()
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise Exception("Repository cloning timed out")
+    if process.returncode != 0:
+        raise Exception(f"Failed to clone repository: {stderr.decode(errors='replace').strip()}")
+
+def _clone_command(repo_url: str, project_path: str) -> list[str]:
+    return ["git", "clone", "--depth=1", "--single-branch", "--no-tags", repo_url, project_path]
+
+def _clone_env() -> dict[str, str]:
+    # Fail fast instead of waiting on a credential prompt nobody can answer
+    return {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
+def _clone_in_process(repo_url: str, project_path: str, timeout: int) -> None:
+    """
+    Clones with libgit2, aborting from the transfer callback once the
+    deadline passes.
+
+    Args:
+        repo_url: URL of the repository to clone
+        project_path: Empty directory to clone into
+        timeout: Maximum clone time in seconds
+    """
+    deadline = time.monotonic() + timeout
+
+    class DeadlineCallbacks(pygit2.RemoteCallbacks):
+        def transfer_progress(self, stats):
+            if time.monotonic() > deadline:
+                raise TimeoutError
+
+    try:
+        pygit2.clone_repository(repo_url, project_path, depth=1, callbacks=DeadlineCallbacks())
+    except TimeoutError:
+        raise Exception("Repository cloning timed out")
+    except pygit2.GitError as e:
+        raise Exception(f"Failed to clone repository: {e}")
+
+def get_head_sha(project_path: str) -> Optional[str]:
+    """
+    Returns the commit a checkout is at.
+
+    Args:
+        project_path: Path to the cloned repository
+
+    Returns:
+        Optional[str]: Hex SHA of HEAD, or None if it cannot be determined
+    """
+    if PYGIT2_AVAILABLE:
+        try:
+            return str(pygit2.Repository(project_path).head.target)
+        except pygit2.GitError:
+            return None
+
+    success, output = run_command(["git", "rev-parse", "HEAD"], project_path, timeout=10)
+    return output.strip() if success else None
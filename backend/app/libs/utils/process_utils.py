@@ -1,11 +1,27 @@
 import subprocess
 import logging
 import os
-from typing import Tuple
+import shutil
+from functools import lru_cache
+from typing import Tuple, Union
 
 logger = logging.getLogger(__name__)
 
-def run_command(command: list[str], cwd: str, timeout: int = 60) -> Tuple[bool, str]:
+@lru_cache(maxsize=64)
+def _resolve_executable(program: str) -> str:
+    """
+    Resolves a program name to its absolute path once per process, so each
+    spawn execs directly instead of searching PATH.
+
+    Args:
+        program: Program name or path (e.g., "ruff")
+
+    Returns:
+        str: Absolute path if found on PATH, otherwise the name unchanged
+    """
+    return shutil.which(program) or program
+
+def run_command(command: list[str], cwd: str, timeout: int = 60, text: bool = True) -> Tuple[bool, Union[str, bytes]]:
     """
     Safely executes an external program with error handling and timeout control.
 
@@ -13,11 +29,13 @@ def run_command(command: list[str], cwd: str, timeout: int = 60) -> Tuple[bool,
         command: List of program arguments (e.g., ["ruff", "check", ".", "--output-format=json"])
         cwd: Path to directory where to run the program (e.g., "/tmp/project123")
         timeout: Maximum execution time in seconds (default 60)
+        text: Decode stdout to str; pass False to get the raw bytes, e.g. for
+            JSON output that is handed straight to a parser (default True)
 
     Returns:
-        Tuple[bool, str]: (success, output_or_error)
+        Tuple[bool, Union[str, bytes]]: (success, output_or_error)
         - success: True if program completed successfully
-        - output_or_error: Program stdout or error description
+        - output_or_error: Program stdout (bytes if text is False) or error description
     """
 
     if not command or not isinstance(command, list):
@@ -37,11 +55,14 @@ def run_command(command: list[str], cwd: str, timeout: int = 60) -> Tuple[bool,
     logger.info(f"Timeout: {timeout} seconds")
 
     try:
+        # No shell, preexec_fn or uid/gid changes: CPython then spawns with
+        # vfork() instead of copying the page tables of a large worker process
         result = subprocess.run(
-            command,
+            [_resolve_executable(command[0]), *command[1:]],
             cwd=cwd,
+            close_fds=True,
             capture_output=True,
-            text=True,
+            text=text,
             timeout=timeout,
             check=False
         )
@@ -59,6 +80,8 @@ def run_command(command: list[str], cwd: str, timeout: int = 60) -> Tuple[bool,
             return (True, result.stdout)
         else:
             error_output = result.stderr if result.stderr else result.stdout
+            if isinstance(error_output, bytes):
+                error_output = error_output.decode("utf-8", errors="replace")
             logger.warning(f"Command '{command[0]}' failed with exit code {result.returncode}")
             return (False, f"Command '{command_str}' failed with exit code {result.returncode}:\n{error_output}")
 
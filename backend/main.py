@@ -1,6 +1,10 @@
 import os
+import sys
+import queue
+import logging
 import pathlib
 import json
+from logging.handlers import QueueHandler, QueueListener
 import dotenv
 from fastapi import FastAPI, APIRouter, Depends
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,6 +12,8 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 dotenv.load_dotenv()
 from app.auth.middleware import AuthConfig, get_authorized_user
 from app.config import settings
+from app.libs.analysis_engine import close_analysis_executor
+from app.libs.database import open_db_pools, close_db_pools
 from app.middleware.security import SecurityHeadersMiddleware, RequestLoggingMiddleware
 try:
     from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -70,6 +76,28 @@ def get_stack_auth_config() -> dict | None:
         "publishableClientKey": publishable_key,
         "jwksUrl": jwks_url,
     }
+_log_listener: QueueListener | None = None
+_log_handler: QueueHandler | None = None
+def install_log_queue() -> None:
+    # Handlers run on the listener thread, so a slow stdout never blocks
+    # the event loop; request code only enqueues the record
+    global _log_listener, _log_handler
+    if _log_listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    _log_handler = QueueHandler(log_queue)
+    _log_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    logging.getLogger().addHandler(_log_handler)
+    _log_listener.start()
+def remove_log_queue() -> None:
+    # Detach the handler too, so a later startup installs a fresh queue
+    # instead of stacking a second one on the root logger
+    global _log_listener, _log_handler
+    if _log_listener is None:
+        return
+    logging.getLogger().removeHandler(_log_handler)
+    _log_listener.stop()
+    _log_listener = _log_handler = None
 def create_app() -> FastAPI:
     is_production = settings.is_production
     app = FastAPI(
@@ -79,6 +107,11 @@ def create_app() -> FastAPI:
         docs_url="/docs" if not is_production else None,
         redoc_url="/redoc" if not is_production else None,
     )
+    app.add_event_handler("startup", install_log_queue)
+    app.add_event_handler("startup", open_db_pools)
+    app.add_event_handler("shutdown", close_db_pools)
+    app.add_event_handler("shutdown", close_analysis_executor)
+    app.add_event_handler("shutdown", remove_log_queue)
     if RATE_LIMITING_AVAILABLE:
         app.state.limiter = limiter
         app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)